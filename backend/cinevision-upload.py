@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+cinevision-upload: upload multipart de vídeos para audio tracks
+
+Uso: python cinevision-upload.py VIDEO --content-language-id ID [opções]
+     (equivalente a python -m cinevision_upload)
+"""
+
+import sys
+
+from cinevision_upload.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Núcleo compartilhado de upload multipart de vídeos para o CineVision
+
+Uso como biblioteca:
+
+    from cinevision_upload import UploadApiClient, upload_video
+
+    with UploadApiClient("http://localhost:3001/api/v1") as client:
+        upload_video(client, "filme.mp4", content_language_id)
+
+Uso pela linha de comando: python -m cinevision_upload --help
+"""
+
+from .engine import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MEMORY_BUDGET,
+    UploadError,
+    count_parts,
+    upload_parts,
+)
+from .batch import BatchItem, load_manifest, run_batch
+from .client import DEFAULT_API_BASE_URL, UploadApiClient, create_session
+from .integrity import FileDigest, composite_etag
+from .journal import UploadJournal, discard_journal, resume_journal
+from .parts import PartSource, PartWindow
+from .retry import DEFAULT_ATTEMPTS, RetryPolicy
+from .sizing import ThroughputProbe, choose_part_size, load_throughput
+from .telemetry import JsonLinesWriter, LatencyHistogram, ProgressTracker
+from .throttle import BandwidthSchedule, TokenBucket
+from .uploader import PROTOCOL_BULK, PROTOCOL_PER_PART, guess_content_type, upload_video
+
+__all__ = [
+    "BandwidthSchedule",
+    "BatchItem",
+    "DEFAULT_API_BASE_URL",
+    "DEFAULT_ATTEMPTS",
+    "DEFAULT_CONCURRENCY",
+    "DEFAULT_MEMORY_BUDGET",
+    "FileDigest",
+    "JsonLinesWriter",
+    "LatencyHistogram",
+    "PROTOCOL_BULK",
+    "PROTOCOL_PER_PART",
+    "PartSource",
+    "PartWindow",
+    "ProgressTracker",
+    "RetryPolicy",
+    "ThroughputProbe",
+    "TokenBucket",
+    "UploadApiClient",
+    "UploadError",
+    "UploadJournal",
+    "choose_part_size",
+    "composite_etag",
+    "count_parts",
+    "create_session",
+    "discard_journal",
+    "guess_content_type",
+    "load_manifest",
+    "load_throughput",
+    "resume_journal",
+    "run_batch",
+    "upload_parts",
+    "upload_video",
+]
@@ -0,0 +1,181 @@
+"""
+Upload em lote a partir de um manifesto (CSV ou JSON) que mapeia arquivos
+para content_language_ids, com orçamento global de conexões e de banda
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from .engine import DEFAULT_CONCURRENCY, UploadError
+from .retry import DEFAULT_ATTEMPTS
+from .uploader import PROTOCOL_BULK, upload_video
+
+DEFAULT_MAX_FILES = 2
+
+ORDER_SIZE = "size"
+ORDER_PRIORITY = "priority"
+ORDER_MANIFEST = "manifest"
+ORDERS = (ORDER_SIZE, ORDER_PRIORITY, ORDER_MANIFEST)
+
+
+class BatchItem:
+    """Uma linha do manifesto: arquivo, audio track e opções daquele arquivo"""
+
+    def __init__(self, file, content_language_id, file_name=None, priority=0, index=0):
+        self.file = file
+        self.content_language_id = content_language_id
+        self.file_name = file_name or None
+        self.priority = int(priority or 0)
+        self.index = index
+
+    def to_dict(self):
+        return {"file": self.file, "content_language_id": self.content_language_id}
+
+    @property
+    def size(self):
+        try:
+            return os.path.getsize(self.file)
+        except OSError:
+            return 0
+
+
+def load_manifest(path):
+    """
+    Lê o manifesto. CSV com cabeçalho ou JSON com uma lista de objetos, ambos
+    com as colunas file, content_language_id e, opcionais, file_name e
+    priority (menor sai primeiro). Caminhos relativos são resolvidos a
+    partir da pasta do manifesto.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+
+    items = []
+    for index, row in enumerate(rows):
+        file = row["file"].strip()
+        if not os.path.isabs(file):
+            file = os.path.join(base_dir, file)
+        items.append(BatchItem(
+            file,
+            row["content_language_id"].strip(),
+            file_name=(row.get("file_name") or "").strip(),
+            priority=row.get("priority") or 0,
+            index=index,
+        ))
+    return items
+
+
+def order_items(items, order=ORDER_SIZE):
+    """Ordem de execução: menores primeiro, por prioridade (depois tamanho) ou a do manifesto"""
+    if order == ORDER_SIZE:
+        return sorted(items, key=lambda item: (item.size, item.index))
+    if order == ORDER_PRIORITY:
+        return sorted(items, key=lambda item: (item.priority, item.size, item.index))
+    return sorted(items, key=lambda item: item.index)
+
+
+def run_batch(
+    client,
+    items,
+    concurrency=DEFAULT_CONCURRENCY,
+    max_files=DEFAULT_MAX_FILES,
+    throttle=None,
+    order=ORDER_SIZE,
+    protocol=PROTOCOL_BULK,
+    part_size=None,
+    retries=DEFAULT_ATTEMPTS,
+    resume=False,
+    on_event=None,
+):
+    """
+    Envia todos os itens e retorna o relatório por arquivo.
+
+    concurrency é o total de parts em voo somando todos os arquivos, e
+    throttle (TokenBucket) o limite de banda somado; até max_files arquivos
+    sobem ao mesmo tempo e dividem esses orçamentos. Quando um arquivo
+    termina, os outros passam a usar os slots dele.
+
+    on_event(event, item, **fields) recebe "started", "finished" e "failed",
+    além dos eventos de upload_video de cada arquivo.
+    """
+    emit = on_event or (lambda event, item, **fields: None)
+    slots = threading.Semaphore(concurrency)
+
+    def run(item):
+        report = {
+            "file": item.file,
+            "content_language_id": item.content_language_id,
+            "size": item.size,
+            "status": "failed",
+            "seconds": 0.0,
+            "mb_per_second": 0.0,
+            "parts": 0,
+            "retries": 0,
+            "sha256": None,
+            "etag": None,
+            "latency": None,
+            "error": None,
+        }
+
+        def on_upload_event(event, **fields):
+            if event == "retry":
+                report["retries"] += 1
+            emit(event, item, **fields)
+
+        emit("started", item)
+        started = time.monotonic()
+        try:
+            result = upload_video(
+                client,
+                item.file,
+                item.content_language_id,
+                file_name=item.file_name,
+                protocol=protocol,
+                concurrency=concurrency,
+                part_size=part_size,
+                retries=retries,
+                resume=resume,
+                on_event=on_upload_event,
+                slots=slots,
+                throttle=throttle,
+            )
+        except (UploadError, requests.RequestException, OSError) as e:
+            report["error"] = str(e)
+        else:
+            report["status"] = "ok"
+            report["parts"] = result["parts"]
+            report["sha256"] = result["sha256"]
+            report["etag"] = result["etag"]
+            report["latency"] = result["latency"]
+
+        report["seconds"] = round(time.monotonic() - started, 2)
+        if report["status"] == "ok" and report["seconds"]:
+            report["mb_per_second"] = round(report["size"] / report["seconds"] / (1024 * 1024), 2)
+
+        emit("finished" if report["status"] == "ok" else "failed", item, report=report)
+        return report
+
+    ordered = order_items(items, order)
+    reports = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_files)) as executor:
+        futures = {executor.submit(run, item): item for item in ordered}
+        for future in as_completed(futures):
+            reports[futures[future].index] = future.result()
+
+    return [reports[item.index] for item in ordered]
+
+
+def write_report(reports, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(reports, f, indent=2, ensure_ascii=False)
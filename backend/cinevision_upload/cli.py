@@ -0,0 +1,366 @@
+"""
+CLI de upload de vídeos para audio tracks do CineVision
+
+Uso: python -m cinevision_upload VIDEO --content-language-id ID [--api URL]
+     [--protocol bulk|per-part] [--concurrency N] [--part-size MB] [--resume]
+     [--bandwidth MBIT] [--bandwidth-schedule 08:00-19:00=20]
+     [--events eventos.jsonl]
+     python -m cinevision_upload --manifest filmes.csv [--max-files N]
+"""
+
+import argparse
+import os
+import sys
+import threading
+
+import requests
+
+from .batch import DEFAULT_MAX_FILES, ORDER_SIZE, ORDERS, load_manifest, run_batch, write_report
+from .client import DEFAULT_API_BASE_URL, UploadApiClient
+from .engine import DEFAULT_CONCURRENCY, UploadError
+from .journal import journal_path
+from .retry import DEFAULT_ATTEMPTS
+from .telemetry import JsonLinesWriter, format_eta
+from .throttle import MBIT, BandwidthSchedule, TokenBucket, mbit_to_bytes
+from .uploader import PROTOCOL_BULK, PROTOCOLS, upload_video
+
+
+def format_size(size_bytes):
+    """Formata tamanho em bytes para formato legível"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.2f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.2f} TB"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cinevision-upload",
+        description="Upload multipart de vídeo para um audio track (content_language)"
+    )
+    parser.add_argument("video", nargs="?", help="Arquivo de vídeo (.mp4 ou .mkv)")
+    parser.add_argument(
+        "--content-language-id", "-l",
+        help="ID do audio track (content_language) que recebe o vídeo"
+    )
+    parser.add_argument(
+        "--manifest", "-m",
+        help="CSV/JSON com colunas file, content_language_id[, file_name, priority] para upload em lote"
+    )
+    parser.add_argument(
+        "--api",
+        default=os.environ.get("CINEVISION_API_URL", DEFAULT_API_BASE_URL),
+        help=f"URL base da API (default: $CINEVISION_API_URL ou {DEFAULT_API_BASE_URL})"
+    )
+    parser.add_argument(
+        "--file-name",
+        help="Nome enviado ao backend para a chave no S3 (default: nome do arquivo)"
+    )
+    parser.add_argument(
+        "--content-type",
+        help="Content-Type do vídeo (default: pela extensão)"
+    )
+    parser.add_argument(
+        "--protocol",
+        choices=PROTOCOLS,
+        default=PROTOCOL_BULK,
+        help="bulk: URLs vêm no initiate-multipart; per-part: uma chamada presigned-url por part"
+    )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Quantidade de parts enviadas ao mesmo tempo (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--part-size", "-p",
+        type=int,
+        metavar="MB",
+        help="Tamanho de cada part em MB (default: automático pelo tamanho do arquivo e vazão medida)"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_ATTEMPTS,
+        help=f"Tentativas por part antes de desistir (default: {DEFAULT_ATTEMPTS})"
+    )
+    parser.add_argument(
+        "--resume", "-r",
+        action="store_true",
+        help="Retoma o upload interrompido registrado no journal ao lado do vídeo"
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        metavar="MBIT",
+        help="Limite de banda total em Mbit/s (default: sem limite)"
+    )
+    parser.add_argument(
+        "--bandwidth-schedule",
+        metavar="FAIXAS",
+        default=os.environ.get("CINEVISION_UPLOAD_SCHEDULE"),
+        help=(
+            "Limite por horário, ex.: '08:00-19:00=20' (20 Mbit/s no expediente); "
+            "fora das faixas vale --bandwidth (default: $CINEVISION_UPLOAD_SCHEDULE)"
+        )
+    )
+    parser.add_argument(
+        "--events",
+        metavar="ARQUIVO",
+        help="Grava cada evento (progress, part, retry, ...) em JSON lines neste arquivo"
+    )
+
+    batch = parser.add_argument_group("upload em lote (--manifest)")
+    batch.add_argument(
+        "--max-files",
+        type=int,
+        default=DEFAULT_MAX_FILES,
+        help=f"Arquivos enviados ao mesmo tempo, dividindo --concurrency (default: {DEFAULT_MAX_FILES})"
+    )
+    batch.add_argument(
+        "--order",
+        choices=ORDERS,
+        default=ORDER_SIZE,
+        help="size: menores primeiro; priority: coluna priority; manifest: ordem do arquivo (default: size)"
+    )
+    batch.add_argument(
+        "--report",
+        help="Onde gravar o relatório JSON por arquivo (default: <manifesto>.report.json)"
+    )
+    return parser
+
+
+def print_event(event, **fields):
+    if event == "resumed":
+        journal = fields["journal"]
+        if journal:
+            print(f"[RESUME] Retomando upload {journal.upload_id}: {len(journal.parts)} parts já estão no S3")
+        else:
+            print("[RESUME] Nenhum upload para retomar, começando do zero")
+    elif event == "discarded":
+        print(f"[RESUME] Upload anterior {fields['journal'].upload_id} abortado (use --resume para retomar)")
+    elif event == "initiated":
+        print("[SUCCESS] Upload iniciado!")
+        print(f"[UPLOAD_ID] {fields['upload_id']}")
+        print(f"[KEY] {fields['storage_key']}")
+        print(f"[CHUNK] Tamanho da part: {format_size(fields['part_size'])}")
+        print(f"[PARTS] Total de parts: {fields['total_parts']}")
+    elif event == "part":
+        part = fields["part"]
+        print(
+            f"[PART {part['PartNumber']}/{fields['total']}] {format_size(part['Size'])} em {part['Seconds']:.1f}s "
+            f"({fields['done']}/{fields['total']}) - ETag: {part['ETag'][:20]}..."
+        )
+    elif event == "progress":
+        print(
+            f"[PROGRESS] {fields['percent']:.1f}% ({format_size(fields['sent'])} de {format_size(fields['total'])}) "
+            f"{fields['mb_per_second']:.2f} MB/s, ETA {format_eta(fields['eta_seconds'])}"
+        )
+    elif event == "retry":
+        print(
+            f"[RETRY] Part {fields['part_number']} tentativa {fields['attempt']} falhou "
+            f"({fields['reason']}), nova tentativa em {fields['delay']:.1f}s"
+        )
+    elif event == "completed":
+        result = fields["result"]
+        speed = result["file_size"] / result["seconds"] if result["seconds"] else 0
+        print()
+        print("=" * 80)
+        print("UPLOAD CONCLUÍDO COM SUCESSO!")
+        print("=" * 80)
+        print(f"[KEY] {result['storage_key']}")
+        print(f"[SHA256] {result['sha256']}")
+        print(f"[ETAG] {result['etag']}")
+        print(f"[TIME] {result['seconds']:.1f}s ({format_size(speed)}/s)")
+        print_latency(result["latency"])
+
+
+def print_latency(latency):
+    if not latency["count"]:
+        return
+    print(f"[LATENCY] {latency['count']} PUTs: p50 {latency['p50']:.1f}s, p95 {latency['p95']:.1f}s, max {latency['max']:.1f}s")
+    peak = max(latency["buckets"].values())
+    for label, count in latency["buckets"].items():
+        if count:
+            print(f"    {label:>7} {'#' * max(1, round(40 * count / peak))} {count}")
+
+
+def print_batch_event(event, item, **fields):
+    name = os.path.basename(item.file)
+    if event == "started":
+        print(f"[BATCH] Iniciando {name} ({format_size(item.size)})")
+    elif event == "finished":
+        report = fields["report"]
+        print(f"[BATCH] OK {name}: {report['parts']} parts em {report['seconds']:.1f}s ({report['mb_per_second']:.2f} MB/s)")
+    elif event == "failed":
+        print(f"[BATCH] ERRO {name}: {fields['report']['error']}")
+    elif event in ("resumed", "discarded", "retry", "progress"):
+        print(f"[{name}] ", end="")
+        print_event(event, **fields)
+
+
+def print_report(reports):
+    print()
+    print("=" * 80)
+    print("RELATÓRIO DO LOTE")
+    print("=" * 80)
+    for report in reports:
+        status = "OK  " if report["status"] == "ok" else "ERRO"
+        print(
+            f"{status} {format_size(report['size']):>10} {report['seconds']:>8.1f}s "
+            f"{report['mb_per_second']:>7.2f} MB/s  retries={report['retries']}  {os.path.basename(report['file'])}"
+        )
+        if report["error"]:
+            print(f"     {report['error']}")
+
+    ok = sum(1 for report in reports if report["status"] == "ok")
+    print(f"\n{ok}/{len(reports)} arquivo(s) enviados")
+
+
+def build_throttle(args):
+    """TokenBucket compartilhado por todos os workers, ou None sem limite de banda"""
+    bandwidth = mbit_to_bytes(args.bandwidth) if args.bandwidth else None
+    schedule = BandwidthSchedule.parse(args.bandwidth_schedule, bandwidth) if args.bandwidth_schedule else None
+    if schedule:
+        return TokenBucket(schedule=schedule)
+    if bandwidth:
+        return TokenBucket(bandwidth)
+    return None
+
+
+def describe_throttle(throttle):
+    if throttle is None:
+        return "sem limite"
+    if throttle.schedule:
+        return throttle.schedule.describe()
+    return f"{throttle.rate / MBIT:g} Mbit/s"
+
+
+def event_handler(args, printer):
+    """
+    on_event que imprime no console e, com --events, grava JSON lines.
+    Devolve (on_event, events_file).
+    """
+    events_file = open(args.events, "a", encoding="utf-8") if args.events else None
+    writer = JsonLinesWriter(events_file) if events_file else None
+
+    # Eventos chegam de várias threads (workers e arquivos do lote)
+    console = threading.Lock()
+
+    def on_event(event, *item, **fields):
+        with console:
+            printer(event, *item, **fields)
+        if writer:
+            if item:
+                writer.write(event, item=item[0], **fields)
+            else:
+                writer.write(event, **fields)
+
+    return on_event, events_file
+
+
+def close_events(events_file):
+    if events_file:
+        events_file.close()
+
+
+def main_batch(args, throttle):
+    items = load_manifest(args.manifest)
+
+    print("=" * 80)
+    print("UPLOAD EM LOTE")
+    print("=" * 80)
+    print(f"[MANIFEST] {args.manifest}: {len(items)} arquivo(s)")
+    print(f"[API] API: {args.api}")
+    print(f"[WORKERS] {args.concurrency} parts em voo, até {args.max_files} arquivo(s) por vez ({args.protocol})")
+    print(f"[BANDWIDTH] {describe_throttle(throttle)}")
+    print()
+
+    with UploadApiClient(args.api, pool_size=args.concurrency) as client:
+        on_event, events_file = event_handler(args, print_batch_event)
+        try:
+            reports = run_batch(
+                client,
+                items,
+                concurrency=args.concurrency,
+                max_files=args.max_files,
+                throttle=throttle,
+                order=args.order,
+                protocol=args.protocol,
+                part_size=args.part_size * 1024 * 1024 if args.part_size else None,
+                retries=args.retries,
+                resume=args.resume,
+                on_event=on_event,
+            )
+        finally:
+            close_events(events_file)
+
+    print_report(reports)
+    report_path = args.report or f"{args.manifest}.report.json"
+    write_report(reports, report_path)
+    print(f"[REPORT] Relatório salvo em: {report_path}")
+
+    return 0 if all(report["status"] == "ok" for report in reports) else 1
+
+
+def main(argv=None):
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.manifest and (not args.video or not args.content_language_id):
+        parser.error("informe VIDEO e --content-language-id, ou --manifest")
+    try:
+        throttle = build_throttle(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.manifest:
+        return main_batch(args, throttle)
+
+    if not os.path.exists(args.video):
+        print(f"[ERROR] Arquivo não encontrado: {args.video}")
+        return 1
+
+    print("=" * 80)
+    print("UPLOAD DE VIDEO PARA AUDIO TRACK")
+    print("=" * 80)
+    print(f"[FILE] Arquivo: {os.path.basename(args.video)}")
+    print(f"[SIZE] Tamanho: {format_size(os.path.getsize(args.video))}")
+    print(f"[ID] Audio Track ID: {args.content_language_id}")
+    print(f"[API] API: {args.api}")
+    print(f"[WORKERS] Concorrência: {args.concurrency} ({args.protocol})")
+    print(f"[BANDWIDTH] {describe_throttle(throttle)}")
+    print()
+
+    with UploadApiClient(args.api, pool_size=args.concurrency) as client:
+        on_event, events_file = event_handler(args, print_event)
+        try:
+            upload_video(
+                client,
+                args.video,
+                args.content_language_id,
+                file_name=args.file_name,
+                content_type=args.content_type,
+                protocol=args.protocol,
+                concurrency=args.concurrency,
+                part_size=args.part_size * 1024 * 1024 if args.part_size else None,
+                retries=args.retries,
+                resume=args.resume,
+                on_event=on_event,
+                throttle=throttle,
+            )
+        except (UploadError, requests.RequestException) as e:
+            on_event("error", error=str(e))
+            print(f"[ERROR] {e}")
+            # Só há o que retomar se o upload chegou a começar
+            if os.path.exists(journal_path(args.video)):
+                print("[RESUME] Rode novamente com --resume para continuar de onde parou")
+            return 1
+        finally:
+            close_events(events_file)
+
+    return 0
@@ -0,0 +1,110 @@
+"""
+Cliente do backend (content-language-upload) com uma requests.Session em pool,
+reaproveitada pelas chamadas à API e pelos PUTs das parts no S3
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .engine import DEFAULT_CONCURRENCY, UploadError
+
+DEFAULT_API_BASE_URL = "http://localhost:3001/api/v1"
+UPLOAD_ENDPOINT = "content-language-upload"
+
+
+def create_session(pool_size=DEFAULT_CONCURRENCY):
+    """Session com conexões keep-alive suficientes para todos os workers"""
+    session = requests.Session()
+    # + chamadas à API e atualizações de progresso
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size + 2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class UploadApiClient:
+    """Endpoints de upload multipart por idioma (audio track) do backend"""
+
+    def __init__(self, api_base_url=DEFAULT_API_BASE_URL, pool_size=DEFAULT_CONCURRENCY, timeout=60):
+        self.api_base_url = api_base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = create_session(pool_size)
+
+    def _post(self, route, payload, timeout=None):
+        response = self.session.post(
+            f"{self.api_base_url}/{UPLOAD_ENDPOINT}/{route}",
+            json=payload,
+            timeout=timeout or self.timeout
+        )
+
+        if response.status_code not in (200, 201):
+            raise UploadError(
+                f"Erro em {route}: {response.status_code} {response.text[:200]}",
+                status_code=response.status_code
+            )
+
+        return response.json()
+
+    def initiate(self, content_language_id, file_name, file_size, content_type, chunk_size):
+        """
+        Inicia o upload multipart. A resposta é normalizada para snake_case
+        (versões antigas do backend respondiam uploadId/presignedUrls).
+        """
+        data = self._post("initiate-multipart", {
+            "content_language_id": content_language_id,
+            "file_name": file_name,
+            "file_size": file_size,
+            "content_type": content_type,
+            "chunk_size": chunk_size
+        })
+        presigned_urls = data.get("presigned_urls") or data.get("presignedUrls") or []
+        return {
+            "upload_id": data.get("upload_id") or data.get("uploadId"),
+            "storage_key": data.get("storage_key") or data.get("key"),
+            "presigned_urls": presigned_urls,
+            "chunk_size": data.get("chunk_size", chunk_size),
+            "total_parts": data.get("total_parts") or len(presigned_urls),
+        }
+
+    def part_url(self, content_language_id, upload_id, part_number):
+        """URL pré-assinada nova para uma part"""
+        data = self._post("presigned-url", {
+            "content_language_id": content_language_id,
+            "upload_id": upload_id,
+            "part_number": part_number
+        })
+        return data.get("url")
+
+    def list_parts(self, content_language_id, upload_id):
+        """Parts que o S3 já tem para o upload, como {part_number: etag}"""
+        data = self._post("list-parts", {
+            "content_language_id": content_language_id,
+            "upload_id": upload_id
+        })
+        return {
+            part["PartNumber"]: part["ETag"].strip('"')
+            for part in data.get("parts", [])
+        }
+
+    def abort(self, content_language_id, upload_id):
+        """Aborta o upload multipart para o S3 descartar as parts órfãs"""
+        return self._post("abort-multipart", {
+            "content_language_id": content_language_id,
+            "upload_id": upload_id
+        })
+
+    def complete(self, content_language_id, upload_id, parts):
+        return self._post("complete-multipart", {
+            "content_language_id": content_language_id,
+            "upload_id": upload_id,
+            "parts": parts
+        }, timeout=max(self.timeout, 120))
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,231 @@
+"""
+Engine de upload multipart concorrente: envia as parts de um arquivo em paralelo
+"""
+
+import os
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from .integrity import content_md5, window_md5
+from .parts import RESIDENT_WINDOW, PartSource
+from .retry import RetryPolicy, is_bad_digest, is_expired_url
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024  # 512MB de parts em memória ao mesmo tempo
+SUCCESS_STATUS = (200, 201, 204)
+
+
+class UploadError(Exception):
+    """Falha no upload de uma part"""
+
+    def __init__(self, message, part_number=None, status_code=None):
+        super().__init__(message)
+        self.part_number = part_number
+        self.status_code = status_code
+
+
+def count_parts(file_size, part_size):
+    """Número de parts necessárias para enviar file_size bytes"""
+    return (file_size + part_size - 1) // part_size
+
+
+def max_in_flight(part_size, concurrency, memory_budget):
+    """Quantas parts podem estar em memória ao mesmo tempo sem estourar o orçamento"""
+    part_memory = min(part_size, RESIDENT_WINDOW)
+    return max(1, min(concurrency, memory_budget // part_memory))
+
+
+def _put_part(http, source, part_number, part_size, presigned_url, content_type, md5, timeout, throttle, on_read):
+    window = source.window(part_number, part_size, throttle, on_read)
+    try:
+        response = http.put(
+            presigned_url,
+            data=window,
+            headers={'Content-Type': content_type, 'Content-MD5': content_md5(md5)},
+            timeout=timeout
+        )
+    finally:
+        window.close()
+    return response, window.length
+
+
+def _upload_part(http, source, part_number, part_size, get_part_url, refresh_part_url,
+                 retry_policy, content_type, timeout, on_retry, on_progress, slots, throttle, part_md5):
+    presigned_url = None
+    refresh = False
+    reason = None
+
+    # Content-MD5 vai no header, então o hash sai antes do corpo: a passada
+    # lê a part do disco e o PUT logo em seguida relê do page cache
+    if part_md5:
+        md5 = part_md5(part_number)
+    else:
+        md5 = window_md5(source.window(part_number, part_size))
+    on_read = (lambda position: on_progress(part_number, position)) if on_progress else None
+
+    for attempt in range(1, retry_policy.attempts + 1):
+        try:
+            if presigned_url is None:
+                presigned_url = (refresh_part_url if refresh else get_part_url)(part_number)
+            with slots or nullcontext():
+                started = time.monotonic()
+                response, size = _put_part(
+                    http, source, part_number, part_size, presigned_url, content_type, md5, timeout, throttle, on_read
+                )
+        except UploadError as e:
+            # Falha ao pedir a URL ao backend
+            if e.status_code is not None and not retry_policy.is_retryable_status(e.status_code):
+                raise
+            reason = str(e)
+        except requests.RequestException as e:
+            if not retry_policy.is_retryable_exception(e):
+                raise UploadError(f"Falha no upload da part {part_number}: {e}", part_number=part_number)
+            reason = f"{type(e).__name__}: {e}"
+        else:
+            if response.status_code in SUCCESS_STATUS:
+                etag = response.headers.get('ETag', '').strip('"')
+                return {
+                    "ETag": etag,
+                    "PartNumber": part_number,
+                    "MD5": md5,
+                    "Size": size,
+                    "Seconds": time.monotonic() - started,
+                    "Attempts": attempt,
+                }
+
+            if is_expired_url(response) and refresh_part_url:
+                # URL do initiate-multipart venceu: pede outra e tenta de novo na hora
+                presigned_url = None
+                refresh = True
+                reason = "URL pré-assinada expirada"
+                if on_retry:
+                    on_retry(part_number, attempt, reason, 0)
+                continue
+
+            if is_bad_digest(response):
+                # O corpo chegou ao S3 diferente do que foi lido: reenvia
+                reason = "Content-MD5 não confere (BadDigest)"
+            elif not retry_policy.is_retryable_status(response.status_code):
+                raise UploadError(
+                    f"Falha no upload da part {part_number}: {response.status_code} {response.text[:200]}",
+                    part_number=part_number,
+                    status_code=response.status_code
+                )
+            else:
+                reason = f"HTTP {response.status_code}"
+
+        if attempt < retry_policy.attempts:
+            delay = retry_policy.delay(attempt)
+            if on_retry:
+                on_retry(part_number, attempt, reason, delay)
+            time.sleep(delay)
+
+    raise UploadError(
+        f"Falha no upload da part {part_number} após {retry_policy.attempts} tentativas: {reason}",
+        part_number=part_number
+    )
+
+
+def upload_parts(
+    file_path,
+    part_size,
+    get_part_url,
+    total_parts=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    memory_budget=DEFAULT_MEMORY_BUDGET,
+    content_type='application/octet-stream',
+    timeout=600,
+    on_part_done=None,
+    completed_parts=None,
+    retry_policy=None,
+    refresh_part_url=None,
+    on_retry=None,
+    on_progress=None,
+    session=None,
+    part_md5=None,
+    slots=None,
+    throttle=None,
+):
+    """
+    Envia as parts de file_path em paralelo e retorna a lista de
+    {"ETag", "PartNumber"} ordenada, pronta para o complete-multipart.
+
+    get_part_url(part_number) devolve a URL pré-assinada da part e é chamada
+    dentro do worker, então pode tanto indexar a lista do initiate-multipart
+    quanto pedir uma URL nova ao endpoint presigned-url.
+
+    on_part_done(part, done, total) é chamada na thread principal a cada part
+    concluída.
+
+    completed_parts ({part_number: etag}) são parts já confirmadas no S3 por
+    uma execução anterior; elas não são reenviadas.
+
+    Cada part é tentada de novo conforme retry_policy (5xx, 408/429, timeouts,
+    conexões resetadas, corpo corrompido no caminho). Cada part vai com
+    Content-MD5 e o dicionário entregue a on_part_done traz o "MD5" binário
+    dela. Se a URL pré-assinada tiver expirado, uma nova é
+    pedida via refresh_part_url(part_number). on_retry(part_number, attempt,
+    reason, delay) é chamada na thread do worker antes de cada nova tentativa.
+
+    on_progress(part_number, sent) é chamada na thread do worker a cada bloco
+    enviado, com os bytes da tentativa atual daquela part (volta a 0 quando
+    a part é reenviada).
+
+    session é a requests.Session (com pool de conexões) usada nos PUTs; sem
+    ela cada PUT abre uma conexão nova.
+
+    part_md5(part_number) devolve o MD5 binário da part (ex.: FileDigest.md5,
+    que calcula junto o SHA-256 do arquivo); sem ela cada worker lê a sua
+    part uma vez só para o MD5.
+
+    slots (threading.Semaphore) e throttle (TokenBucket) podem ser
+    compartilhados entre vários uploads para dividir um orçamento global de
+    conexões e de banda.
+    """
+    http = session or requests
+    retry_policy = retry_policy or RetryPolicy()
+    refresh_part_url = refresh_part_url or get_part_url
+
+    if os.path.getsize(file_path) == 0:
+        # mmap não mapeia arquivo vazio, e o S3 não tem multipart sem parts
+        raise UploadError(f"Arquivo vazio, nada para enviar: {file_path}")
+
+    source = PartSource(file_path)
+    if total_parts is None:
+        total_parts = count_parts(source.file_size, part_size)
+
+    workers = max_in_flight(part_size, concurrency, memory_budget)
+    completed = {
+        part_number: {"ETag": etag, "PartNumber": part_number}
+        for part_number, etag in (completed_parts or {}).items()
+        if part_number <= total_parts
+    }
+
+    with source, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _upload_part, http, source, part_number, part_size, get_part_url, refresh_part_url,
+                retry_policy, content_type, timeout, on_retry, on_progress, slots, throttle, part_md5
+            )
+            for part_number in range(1, total_parts + 1)
+            if part_number not in completed
+        ]
+
+        try:
+            for future in as_completed(futures):
+                part = future.result()
+                completed[part["PartNumber"]] = part
+                if on_part_done:
+                    on_part_done(part, len(completed), total_parts)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return [
+        {"ETag": completed[n]["ETag"], "PartNumber": n}
+        for n in sorted(completed)
+    ]
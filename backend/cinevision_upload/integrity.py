@@ -0,0 +1,129 @@
+"""
+Integridade do upload: MD5 de cada part (enviado como Content-MD5, o S3
+recusa a part se o corpo chegar diferente), SHA-256 do arquivo inteiro e o
+ETag composto do multipart para o relatório
+"""
+
+import base64
+import hashlib
+import threading
+
+from .parts import RESIDENT_WINDOW, PartSource
+
+# Hash em blocos do tamanho da janela residente: cada bloco é devolvido ao SO
+# logo depois de hasheado, como no envio
+HASH_BLOCK = RESIDENT_WINDOW
+
+
+def _hash_range(source, offset, length, *hashes):
+    end = offset + length
+    for start in range(offset, end, HASH_BLOCK):
+        size = min(HASH_BLOCK, end - start)
+        block = source.view(start, size)
+        for h in hashes:
+            h.update(block)
+        block.release()
+        source.release(start, size)
+
+
+def window_md5(window):
+    """MD5 (digest binário) do trecho de uma PartWindow"""
+    md5 = hashlib.md5()
+    _hash_range(window.source, window.offset, window.length, md5)
+    return md5.digest()
+
+
+def content_md5(digest):
+    """Valor do header Content-MD5: MD5 binário em base64"""
+    return base64.b64encode(digest).decode('ascii')
+
+
+def composite_etag(digests):
+    """ETag que o S3 dá ao objeto multipart: MD5 dos MD5s das parts + '-N'"""
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+
+class FileDigest:
+    """
+    MD5 de cada part e SHA-256 do arquivo inteiro numa passada só pelo
+    disco. Uma thread lê as parts na ordem do arquivo (o SHA-256 só aceita
+    os bytes em ordem) e alimenta os dois hashes com o mesmo bloco; o worker
+    pega o Content-MD5 da sua part em md5(), e o PUT logo em seguida relê a
+    part do page cache. A thread só avança até a maior part pedida por um
+    worker (ou já enviada), então não lê o arquivo muito à frente do envio.
+
+    add(part_number) marca uma part que não vai ser pedida (ex.: já enviada
+    numa execução anterior); ela também entra nos hashes.
+    """
+
+    def __init__(self, file_path, part_size, total_parts):
+        self.part_size = part_size
+        self.total_parts = total_parts
+        self._source = PartSource(file_path)
+        self._sha256 = hashlib.sha256()
+        self._md5 = {}
+        self._wanted = set()
+        self._next = 1
+        self._error = None
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, part_number):
+        with self._cond:
+            self._wanted.add(part_number)
+            self._cond.notify_all()
+
+    def md5(self, part_number):
+        """MD5 binário da part; bloqueia até a thread chegar nela"""
+        with self._cond:
+            self._wanted.add(part_number)
+            self._cond.notify_all()
+            while part_number not in self._md5 and self._error is None:
+                self._cond.wait()
+            if part_number not in self._md5:
+                raise self._error
+            return self._md5[part_number]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._next not in self._wanted and not self._stopped:
+                    self._cond.wait()
+                if self._next not in self._wanted or self._next > self.total_parts:
+                    return
+                part_number = self._next
+
+            md5 = hashlib.md5()
+            window = self._source.window(part_number, self.part_size)
+            try:
+                _hash_range(self._source, window.offset, window.length, self._sha256, md5)
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                self._md5[part_number] = md5.digest()
+                self._next += 1
+                self._cond.notify_all()
+
+    def finish(self):
+        """
+        Espera o SHA-256 alcançar a última part marcada e devolve
+        {"sha256", "etag"}, ou None se o upload não chegou ao fim.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._source.close()
+
+        if self._next <= self.total_parts:
+            return None
+        return {
+            "sha256": self._sha256.hexdigest(),
+            "etag": composite_etag([self._md5[n] for n in range(1, self.total_parts + 1)]),
+        }
@@ -0,0 +1,175 @@
+"""
+Journal de checkpoint gravado ao lado do vídeo para retomar uploads interrompidos
+"""
+
+import json
+import os
+
+from .engine import UploadError
+
+JOURNAL_SUFFIX = ".upload.json"
+JOURNAL_VERSION = 1
+
+
+def journal_path(video_file):
+    return f"{video_file}{JOURNAL_SUFFIX}"
+
+
+class UploadJournal:
+    """
+    Estado de um upload multipart em andamento: upload_id, storage_key,
+    tamanho das parts e ETags das parts já confirmadas.
+    """
+
+    def __init__(self, path, content_language_id, upload_id, storage_key,
+                 file_size, file_mtime, part_size, parts=None):
+        self.path = path
+        self.content_language_id = content_language_id
+        self.upload_id = upload_id
+        self.storage_key = storage_key
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+        self.part_size = part_size
+        self.parts = dict(parts or {})
+
+    @classmethod
+    def create(cls, video_file, content_language_id, upload_id, storage_key, part_size):
+        stat = os.stat(video_file)
+        return cls(
+            journal_path(video_file),
+            content_language_id,
+            upload_id,
+            storage_key,
+            stat.st_size,
+            int(stat.st_mtime),
+            part_size,
+        )
+
+    @classmethod
+    def load(cls, video_file):
+        """Lê o journal do vídeo, ou None se não existir ou estiver ilegível"""
+        path = journal_path(video_file)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != JOURNAL_VERSION:
+            return None
+
+        return cls(
+            path,
+            data["content_language_id"],
+            data["upload_id"],
+            data.get("storage_key"),
+            data["file_size"],
+            data["file_mtime"],
+            data["part_size"],
+            {int(n): etag for n, etag in data.get("parts", {}).items()},
+        )
+
+    def matches(self, video_file, content_language_id, part_size=None):
+        """O journal ainda descreve este arquivo, este audio track e este tamanho de part?"""
+        stat = os.stat(video_file)
+        return (
+            self.content_language_id == content_language_id
+            and self.file_size == stat.st_size
+            and self.file_mtime == int(stat.st_mtime)
+            and (part_size is None or self.part_size == part_size)
+        )
+
+    def reconcile(self, remote_parts):
+        """
+        Mantém só as parts que o S3 também tem com o mesmo ETag.
+        Parts que o S3 tem mas o journal não (o processo morreu antes de
+        gravar) também são aproveitadas. Retorna as parts válidas.
+        """
+        self.parts = {
+            part_number: etag
+            for part_number, etag in remote_parts.items()
+            if self.parts.get(part_number, etag) == etag
+        }
+        self.save()
+        return dict(self.parts)
+
+    def record_part(self, part_number, etag):
+        self.parts[part_number] = etag
+        self.save()
+
+    def to_dict(self):
+        return {
+            "version": JOURNAL_VERSION,
+            "content_language_id": self.content_language_id,
+            "upload_id": self.upload_id,
+            "storage_key": self.storage_key,
+            "file_size": self.file_size,
+            "file_mtime": self.file_mtime,
+            "part_size": self.part_size,
+            "parts": {str(n): etag for n, etag in sorted(self.parts.items())},
+        }
+
+    def save(self):
+        data = self.to_dict()
+        # Grava num arquivo temporário e troca, para um crash não deixar JSON pela metade
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def resume_journal(video_file, client, content_language_id, part_size=None):
+    """
+    Carrega o journal do vídeo e confere com as parts que o S3 realmente tem
+    (list-parts). Retorna None quando não há upload que possa ser retomado;
+    nesse caso o upload antigo é abortado e o journal apagado, para o
+    upload novo não deixar parts órfãs.
+
+    Só o 404 do list-parts (NoSuchUpload: upload abortado ou expirado) quer
+    dizer que não há o que retomar; qualquer outro erro sobe, e o journal
+    continua lá para a próxima tentativa.
+    """
+    journal = UploadJournal.load(video_file)
+    if journal is None:
+        return None
+    if not journal.matches(video_file, content_language_id, part_size):
+        _abandon(journal, client)
+        return None
+
+    try:
+        remote_parts = client.list_parts(content_language_id, journal.upload_id)
+    except UploadError as e:
+        if e.status_code != 404:
+            raise
+        journal.delete()
+        return None
+
+    journal.reconcile(remote_parts)
+    return journal
+
+
+def _abandon(journal, client):
+    try:
+        client.abort(journal.content_language_id, journal.upload_id)
+    except UploadError:
+        pass
+    journal.delete()
+
+
+def discard_journal(video_file, client):
+    """
+    Aborta no S3 o upload registrado num journal antigo e apaga o journal.
+    Usado quando o upload recomeça do zero, para não deixar parts órfãs.
+    """
+    journal = UploadJournal.load(video_file)
+    if journal is None:
+        return None
+
+    _abandon(journal, client)
+    return journal
@@ -0,0 +1,117 @@
+"""
+Leitura das parts via mmap: cada part é uma janela (offset, length) sobre o
+arquivo mapeado, entregue ao requests como corpo em streaming, sem copiar a
+part inteira para um bytes novo.
+"""
+
+import mmap
+import os
+
+# Páginas já enviadas são devolvidas ao SO a cada RESIDENT_WINDOW bytes, então
+# cada part em andamento ocupa no máximo isso de memória residente
+RESIDENT_WINDOW = 8 * 1024 * 1024
+
+
+class PartSource:
+    """Vídeo mapeado em memória, compartilhado por todos os workers"""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.file_size = os.path.getsize(file_path)
+        self._file = open(file_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+    def window(self, part_number, part_size, throttle=None, on_read=None):
+        offset = (part_number - 1) * part_size
+        length = max(0, min(part_size, self.file_size - offset))
+        return PartWindow(self, offset, length, throttle, on_read)
+
+    def view(self, offset, length):
+        return self._view[offset:offset + length]
+
+    def release(self, offset, length):
+        """Tira do RSS as páginas já enviadas (continuam no page cache do SO)"""
+        if not hasattr(mmap, 'MADV_DONTNEED') or offset % mmap.PAGESIZE:
+            return
+        try:
+            self._map.madvise(mmap.MADV_DONTNEED, offset, length)
+        except (OSError, ValueError):
+            pass
+
+    def close(self):
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            # Ainda existe uma fatia viva (ex.: traceback de uma part que falhou);
+            # o mapeamento é liberado pelo GC quando ela morrer
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PartWindow:
+    """
+    Objeto file-like somente leitura sobre um trecho do PartSource.
+    read() devolve fatias memoryview do mmap, que o urllib3 manda direto
+    para o socket em blocos pequenos. Com throttle (TokenBucket), cada bloco
+    espera pelos seus bytes antes de sair. on_read(position) recebe quantos
+    bytes da part já foram entregues, a cada bloco.
+    """
+
+    def __init__(self, source, offset, length, throttle=None, on_read=None):
+        self.source = source
+        self.offset = offset
+        self.length = length
+        self.throttle = throttle
+        self.on_read = on_read
+        self._pos = 0
+        self._released = 0
+
+    def __len__(self):
+        return self.length
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        remaining = self.length - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+
+        if self.throttle and size:
+            self.throttle.consume(size)
+
+        chunk = self.source.view(self.offset + self._pos, size)
+        self._pos += size
+
+        if self._pos - self._released >= RESIDENT_WINDOW:
+            self.source.release(self.offset + self._released, RESIDENT_WINDOW)
+            self._released += RESIDENT_WINDOW
+
+        if self.on_read and size:
+            self.on_read(self._pos)
+
+        return chunk
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            pos += self._pos
+        elif whence == os.SEEK_END:
+            pos += self.length
+        self._pos = max(0, min(pos, self.length))
+        return self._pos
+
+    def close(self):
+        if self._released < self.length:
+            self.source.release(self.offset + self._released, self.length - self._released)
+            self._released = self.length
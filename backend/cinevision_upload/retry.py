@@ -0,0 +1,46 @@
+"""
+Política de retry por part: backoff exponencial com jitter e classificação
+das falhas que valem uma nova tentativa
+"""
+
+import random
+
+import requests
+
+DEFAULT_ATTEMPTS = 5
+RETRYABLE_STATUS = (408, 429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    attempts é o total de tentativas por part. A espera antes da tentativa n
+    é sorteada entre 0 e min(max_delay, base_delay * 2^n) ("full jitter"),
+    para os workers não martelarem o S3 todos ao mesmo tempo.
+    """
+
+    def __init__(self, attempts=DEFAULT_ATTEMPTS, base_delay=1.0, max_delay=60.0):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def is_retryable_status(status_code):
+        return status_code in RETRYABLE_STATUS
+
+    @staticmethod
+    def is_retryable_exception(error):
+        """Timeouts e conexões resetadas/recusadas"""
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def is_expired_url(response):
+    """O S3 responde 403 AccessDenied 'Request has expired' para URL pré-assinada vencida"""
+    return response.status_code == 403 and "expired" in response.text.lower()
+
+
+def is_bad_digest(response):
+    """Content-MD5 diferente do corpo recebido: o S3 responde 400 BadDigest"""
+    return response.status_code == 400 and "BadDigest" in response.text
@@ -0,0 +1,112 @@
+"""
+Escolha adaptativa do tamanho das parts a partir do tamanho do arquivo, dos
+limites do S3 e da vazão medida nas primeiras parts dos uploads anteriores
+"""
+
+import json
+import math
+import os
+import statistics
+
+MB = 1024 * 1024
+
+# Limites do S3 para multipart upload
+MIN_PART_SIZE = 5 * MB
+MAX_PART_SIZE = 5 * 1024 * MB
+MAX_PARTS = 10000
+
+# Sem medição de vazão: parts entre 16MB e 128MB, ao menos 4 por worker
+DEFAULT_MIN_PART_SIZE = 16 * MB
+DEFAULT_MAX_PART_SIZE = 128 * MB
+PARTS_PER_WORKER = 4
+
+# Custo fixo de cada PUT (handshake, assinatura, latência) que queremos manter
+# abaixo de MAX_REQUEST_OVERHEAD do tempo da part, e o máximo de segundos de
+# envio que aceitamos perder quando uma part precisa ser reenviada
+REQUEST_OVERHEAD_SECONDS = 0.5
+MAX_REQUEST_OVERHEAD = 0.02
+MAX_RETRY_SECONDS = 120
+
+PROBE_PARTS = 4
+THROUGHPUT_FILE = os.path.join(os.path.expanduser("~"), ".cinevision-upload.json")
+
+
+def _round_up(size, multiple=MB):
+    return int(math.ceil(size / multiple) * multiple)
+
+
+def min_part_size_for(file_size):
+    """Menor part que ainda cabe no limite de 10.000 parts do S3"""
+    return _round_up(max(MIN_PART_SIZE, math.ceil(file_size / MAX_PARTS)))
+
+
+def choose_part_size(file_size, throughput=None, concurrency=1):
+    """
+    Tamanho de part para file_size bytes.
+
+    throughput é a vazão medida por conexão (bytes/s). Com ela a part é a
+    menor que mantém o overhead por requisição abaixo de MAX_REQUEST_OVERHEAD,
+    limitada a MAX_RETRY_SECONDS de envio para um retry não custar caro.
+    Sem ela, o tamanho sai só do arquivo e da concorrência.
+    """
+    floor = min_part_size_for(file_size)
+
+    if throughput:
+        size = throughput * REQUEST_OVERHEAD_SECONDS / MAX_REQUEST_OVERHEAD
+        size = min(size, throughput * MAX_RETRY_SECONDS)
+    else:
+        size = file_size / (max(1, concurrency) * PARTS_PER_WORKER)
+        size = min(max(size, DEFAULT_MIN_PART_SIZE), DEFAULT_MAX_PART_SIZE)
+
+    # Parts suficientes para ocupar todos os workers, se o arquivo permitir
+    if concurrency > 1:
+        size = min(size, file_size / concurrency)
+
+    size = max(_round_up(size), floor)
+    return min(size, MAX_PART_SIZE)
+
+
+def load_throughput(path=THROUGHPUT_FILE):
+    """Vazão por conexão medida no último upload, ou None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("throughput")
+    except (OSError, ValueError):
+        return None
+
+
+class ThroughputProbe:
+    """
+    Mede a vazão por conexão nas primeiras PROBE_PARTS parts de um upload e
+    guarda a média com a medição anterior para o próximo initiate-multipart.
+    """
+
+    def __init__(self, parts=PROBE_PARTS):
+        self.parts = parts
+        self.samples = []
+
+    def record(self, size, seconds):
+        if len(self.samples) < self.parts and seconds > 0:
+            self.samples.append(size / seconds)
+
+    @property
+    def throughput(self):
+        if not self.samples:
+            return None
+        return statistics.median(self.samples)
+
+    def save(self, path=THROUGHPUT_FILE):
+        measured = self.throughput
+        if measured is None:
+            return None
+
+        previous = load_throughput(path)
+        if previous:
+            measured = (measured + previous) / 2
+
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"throughput": measured}, f)
+        except OSError:
+            pass
+        return measured
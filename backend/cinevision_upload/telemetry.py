@@ -0,0 +1,139 @@
+"""
+Telemetria do upload: progresso em bytes com MB/s e ETA, histograma de
+latência das parts e eventos em JSON lines
+"""
+
+import bisect
+import collections
+import json
+import threading
+import time
+
+# Janela da média móvel de vazão
+RATE_WINDOW_SECONDS = 10.0
+# Intervalo mínimo entre dois eventos "progress"
+PROGRESS_INTERVAL = 1.0
+
+# Limites (segundos) das faixas do histograma de latência por part
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300)
+
+
+class ProgressTracker:
+    """
+    Bytes enviados do arquivo inteiro, somando os workers. update() é
+    chamada das threads dos workers com a posição de cada part; uma part
+    reenviada volta a 0 e desconta o que tinha sido contado.
+    """
+
+    def __init__(self, total_bytes, total_parts, done_bytes=0, done_parts=0, interval=PROGRESS_INTERVAL):
+        self.total_bytes = total_bytes
+        self.total_parts = total_parts
+        self.done_parts = done_parts
+        self.interval = interval
+        self._sent = done_bytes
+        self._parts = {}
+        started = time.monotonic()
+        self._samples = collections.deque([(started, done_bytes)])
+        self._last_report = started
+        self._lock = threading.Lock()
+
+    def update(self, part_number, position):
+        """Registra a posição da part; devolve True quando é hora de emitir um evento "progress" """
+        with self._lock:
+            self._sent += position - self._parts.get(part_number, 0)
+            self._parts[part_number] = position
+
+            now = time.monotonic()
+            if now - self._samples[-1][0] >= 0.2:
+                self._samples.append((now, self._sent))
+                while len(self._samples) > 2 and now - self._samples[0][0] > RATE_WINDOW_SECONDS:
+                    self._samples.popleft()
+
+            if now - self._last_report < self.interval:
+                return False
+            self._last_report = now
+            return True
+
+    def part_done(self):
+        with self._lock:
+            self.done_parts += 1
+
+    def snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            first_time, first_sent = self._samples[0]
+            elapsed = now - first_time
+            rate = max(0.0, (self._sent - first_sent) / elapsed) if elapsed > 0 else 0.0
+            remaining = max(0, self.total_bytes - self._sent)
+            return {
+                "sent": self._sent,
+                "total": self.total_bytes,
+                "percent": 100.0 * self._sent / self.total_bytes if self.total_bytes else 100.0,
+                "parts_done": self.done_parts,
+                "total_parts": self.total_parts,
+                "mb_per_second": rate / (1024 * 1024),
+                "eta_seconds": remaining / rate if rate > 0 else None,
+            }
+
+
+class LatencyHistogram:
+    """Tempo de PUT de cada part, em faixas de LATENCY_BUCKETS, com p50/p95"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.samples = []
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.samples.append(seconds)
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        labels = [f"<={limit}s" for limit in self.buckets] + [f">{self.buckets[-1]}s"]
+        return {
+            "count": len(self.samples),
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "max": max(self.samples) if self.samples else None,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def _to_json(value):
+    """MD5s em hex; UploadJournal e BatchItem pelo to_dict()"""
+    if isinstance(value, bytes):
+        return value.hex()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
+
+
+class JsonLinesWriter:
+    """Um evento por linha: {"ts", "event", ...campos}. Pode ser chamado de várias threads."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, event, **fields):
+        line = json.dumps({"ts": time.time(), "event": event, **fields}, default=_to_json, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
@@ -0,0 +1,129 @@
+"""
+Limite de banda compartilhado entre todos os workers (token bucket), fixo
+ou variando conforme o horário
+"""
+
+import datetime
+import threading
+import time
+
+MBIT = 1000 * 1000 / 8  # bytes/s em 1 Mbit/s
+
+# De quanto em quanto tempo o token bucket consulta a agenda de banda
+SCHEDULE_CHECK_SECONDS = 1.0
+
+
+def mbit_to_bytes(mbit):
+    return mbit * MBIT
+
+
+def _parse_clock(text):
+    hours, minutes = text.strip().split(":")
+    minute = int(hours) * 60 + int(minutes)
+    if not 0 <= minute <= 24 * 60:
+        raise ValueError(f"Horário inválido: {text}")
+    return minute
+
+
+class BandwidthSchedule:
+    """
+    Limite de banda por faixa de horário (hora local). Cada faixa é
+    (início, fim, bytes/s) em minutos desde a meia-noite; faixas que passam da
+    meia-noite (ex.: 22:00-06:00) valem. Fora de todas as faixas vale default
+    (None = sem limite).
+    """
+
+    def __init__(self, windows, default=None):
+        self.windows = windows
+        self.default = default
+
+    @classmethod
+    def parse(cls, text, default=None):
+        """
+        Lê "08:00-19:00=20,19:00-23:00=50" (limites em Mbit/s). Um limite
+        0 ou "off" deixa a faixa sem limite.
+        """
+        windows = []
+        for rule in text.split(","):
+            if not rule.strip():
+                continue
+            try:
+                span, limit = rule.split("=")
+                start, end = span.split("-")
+                limit = limit.strip().lower()
+                rate = None if limit in ("0", "off") else mbit_to_bytes(float(limit))
+                windows.append((_parse_clock(start), _parse_clock(end), rate))
+            except ValueError:
+                raise ValueError(f"Faixa de banda inválida: '{rule.strip()}' (use HH:MM-HH:MM=MBIT)")
+        return cls(windows, default)
+
+    def rate_at(self, moment=None):
+        """Limite em bytes/s (ou None) no horário moment (default: agora)"""
+        moment = moment or datetime.datetime.now()
+        minute = moment.hour * 60 + moment.minute
+        for start, end, rate in self.windows:
+            if start <= end:
+                inside = start <= minute < end
+            else:
+                inside = minute >= start or minute < end
+            if inside:
+                return rate
+        return self.default
+
+    def describe(self):
+        def label(rate):
+            return f"{rate / MBIT:g} Mbit/s" if rate else "sem limite"
+
+        rules = [
+            f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d} {label(rate)}"
+            for start, end, rate in self.windows
+        ]
+        rules.append(f"resto {label(self.default)}")
+        return ", ".join(rules)
+
+
+class TokenBucket:
+    """
+    Token bucket em bytes/s. consume() pode deixar o saldo negativo (dívida)
+    e o chamador dorme fora do lock até a dívida ser paga, então vários
+    workers dividem a banda sem ficar disputando o lock.
+
+    Com schedule (BandwidthSchedule) o limite é reconsultado a cada
+    SCHEDULE_CHECK_SECONDS; rate None deixa passar sem limite.
+    """
+
+    def __init__(self, rate=None, burst=None, schedule=None):
+        self.schedule = schedule
+        self._burst = burst
+        self._tokens = 0
+        self._updated = time.monotonic()
+        self._checked = self._updated
+        self._lock = threading.Lock()
+        self._set_rate(schedule.rate_at() if schedule else rate)
+        self._tokens = self.burst
+
+    def _set_rate(self, rate):
+        self.rate = rate
+        self.burst = self._burst or max(rate or 0, 64 * 1024)
+        self._tokens = min(self._tokens, self.burst)
+
+    def consume(self, amount):
+        with self._lock:
+            now = time.monotonic()
+            if self.schedule and now - self._checked >= SCHEDULE_CHECK_SECONDS:
+                self._checked = now
+                rate = self.schedule.rate_at()
+                if rate != self.rate:
+                    self._set_rate(rate)
+
+            if self.rate is None:
+                self._updated = now
+                return
+
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,177 @@
+"""
+Fluxo completo de upload de um vídeo para um audio track:
+initiate-multipart -> parts em paralelo -> complete-multipart
+"""
+
+import os
+import time
+
+from .engine import DEFAULT_CONCURRENCY, UploadError, count_parts, upload_parts
+from .integrity import FileDigest
+from .journal import UploadJournal, discard_journal, resume_journal
+from .retry import DEFAULT_ATTEMPTS, RetryPolicy
+from .sizing import ThroughputProbe, choose_part_size, load_throughput
+from .telemetry import LatencyHistogram, ProgressTracker
+
+# bulk: URLs de todas as parts vêm no initiate-multipart
+# per-part: cada part pede a sua URL ao endpoint presigned-url
+PROTOCOL_BULK = "bulk"
+PROTOCOL_PER_PART = "per-part"
+PROTOCOLS = (PROTOCOL_BULK, PROTOCOL_PER_PART)
+
+CONTENT_TYPES = {
+    ".mp4": "video/mp4",
+    ".mkv": "video/x-matroska",
+}
+
+PART_TIMEOUT = 600  # 10 minutos por part
+
+
+def guess_content_type(video_file):
+    extension = os.path.splitext(video_file)[1].lower()
+    return CONTENT_TYPES.get(extension, "video/mp4")
+
+
+def upload_video(
+    client,
+    video_file,
+    content_language_id,
+    file_name=None,
+    content_type=None,
+    protocol=PROTOCOL_BULK,
+    concurrency=DEFAULT_CONCURRENCY,
+    part_size=None,
+    retries=DEFAULT_ATTEMPTS,
+    resume=False,
+    on_event=None,
+    slots=None,
+    throttle=None,
+):
+    """
+    Envia video_file para o audio track content_language_id e retorna um
+    resumo do upload. Levanta UploadError se alguma etapa falhar; nesse caso
+    o journal fica no disco e o upload pode ser retomado com resume=True.
+
+    on_event(event, **fields) recebe o andamento: "resumed", "discarded",
+    "initiated", "part", "retry", "progress" e "completed". "progress" sai no
+    máximo uma vez por segundo, de uma thread de worker, com bytes enviados,
+    MB/s da janela recente e ETA (ProgressTracker.snapshot).
+
+    O resultado traz o SHA-256 do arquivo e o ETag composto esperado para
+    o objeto no S3, calculados durante o envio, e o histograma de latência
+    dos PUTs.
+
+    slots e throttle são repassados ao engine (orçamento global do batch).
+    """
+    emit = on_event or (lambda event, **fields: None)
+    file_size = os.path.getsize(video_file)
+    if file_size == 0:
+        # Antes do initiate-multipart, para não deixar um upload aberto no S3
+        raise UploadError(f"Arquivo vazio, nada para enviar: {video_file}")
+    file_name = file_name or os.path.basename(video_file)
+    content_type = content_type or guess_content_type(video_file)
+
+    journal = None
+    if resume:
+        journal = resume_journal(video_file, client, content_language_id, part_size)
+        emit("resumed", journal=journal)
+    else:
+        stale = discard_journal(video_file, client)
+        if stale:
+            emit("discarded", journal=stale)
+
+    presigned_urls = []
+    if journal:
+        part_size = journal.part_size
+    else:
+        part_size = part_size or choose_part_size(file_size, load_throughput(), concurrency)
+        upload = client.initiate(content_language_id, file_name, file_size, content_type, part_size)
+        if protocol == PROTOCOL_BULK:
+            presigned_urls = upload["presigned_urls"]
+
+        journal = UploadJournal.create(
+            video_file, content_language_id, upload["upload_id"], upload["storage_key"], part_size
+        )
+        journal.save()
+        emit("initiated", upload_id=journal.upload_id, storage_key=journal.storage_key,
+             part_size=part_size, total_parts=count_parts(file_size, part_size))
+
+    upload_id = journal.upload_id
+    total_parts = count_parts(file_size, part_size)
+
+    def refresh_part_url(part_number):
+        return client.part_url(content_language_id, upload_id, part_number)
+
+    def get_part_url(part_number):
+        if part_number <= len(presigned_urls):
+            return presigned_urls[part_number - 1]
+        return refresh_part_url(part_number)
+
+    probe = ThroughputProbe()
+    latency = LatencyHistogram()
+    digest = FileDigest(video_file, part_size, total_parts)
+    for part_number in journal.parts:
+        digest.add(part_number)
+
+    resumed_bytes = sum(min(part_size, file_size - (n - 1) * part_size) for n in journal.parts)
+    tracker = ProgressTracker(file_size, total_parts, resumed_bytes, len(journal.parts))
+
+    def on_progress(part_number, sent):
+        if tracker.update(part_number, sent):
+            emit("progress", **tracker.snapshot())
+
+    def on_part_done(part, done, total):
+        journal.record_part(part["PartNumber"], part["ETag"])
+        probe.record(part["Size"], part["Seconds"])
+        latency.record(part["Seconds"])
+        tracker.part_done()
+        emit("part", part=part, done=done, total=total)
+
+    def on_retry(part_number, attempt, reason, delay):
+        emit("retry", part_number=part_number, attempt=attempt, reason=reason, delay=delay)
+
+    started = time.monotonic()
+    try:
+        parts = upload_parts(
+            video_file,
+            part_size,
+            get_part_url,
+            total_parts=total_parts,
+            concurrency=concurrency,
+            content_type=content_type,
+            timeout=PART_TIMEOUT,
+            on_part_done=on_part_done,
+            completed_parts=journal.parts,
+            retry_policy=RetryPolicy(retries),
+            refresh_part_url=refresh_part_url,
+            on_retry=on_retry,
+            on_progress=on_progress,
+            session=client.session,
+            part_md5=digest.md5,
+            slots=slots,
+            throttle=throttle,
+        )
+    finally:
+        integrity = digest.finish()
+        # Vazão medida com limite de banda não representa o link
+        if throttle is None:
+            probe.save()
+
+    response = client.complete(content_language_id, upload_id, parts)
+    journal.delete()
+
+    result = {
+        "file": video_file,
+        "upload_id": upload_id,
+        "storage_key": journal.storage_key,
+        "file_size": file_size,
+        "part_size": part_size,
+        "parts": len(parts),
+        "sha256": integrity["sha256"],
+        "etag": integrity["etag"],
+        "latency": latency.summary(),
+        "seconds": time.monotonic() - started,
+        "response": response,
+    }
+    emit("completed", result=result)
+    return result
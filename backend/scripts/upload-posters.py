@@ -1,55 +1,556 @@
+#!/usr/bin/env python3
+"""
+Upload dos posters dos filmes para o S3 (cinevision-capas, posters/<id>.png)
+
+Os uploads rodam em paralelo num único transfer manager do boto3: um client
+só, com o pool de conexões do tamanho da concorrência, e multipart
+automático para imagens grandes. No fim sai um resumo com vazão e falhas.
+
+Com --sync só sobe o que é novo ou mudou: o ETag de cada poster local é
+comparado com a listagem de posters/ no bucket (uma chamada a cada 1000
+objetos). Os hashes locais ficam num cache por tamanho/mtime, então
+arquivos que não mudaram nem são relidos.
+
+Os filmes são descobertos na biblioteca (MOVIES_DIR, pastas
+"FILME_ <título> (<ano>)") e vão entrando no upload conforme são achados.
+
+Além do POSTER.png original, cada poster ganha versões reduzidas para o
+site (WebP em 200/400/800px e um JPEG de 400px para navegadores antigos;
+AVIF com --avif), geradas com Pillow num pool de processos e enviadas em
+posters/<id>/<versão>/ com Cache-Control de um ano. A versão vem do hash
+do original, então um poster novo nunca pega a cópia antiga do cache. As
+keys de cada filme ficam em posters-manifest.json, junto com o blurhash
+do poster (placeholder de ~30 caracteres que o site desenha borrado
+enquanto a imagem carrega).
+
+Uso: python upload-posters.py [--pasta E:\\movies] [--workers 16] [--sync] [--avif]
+"""
+
+import argparse
+import hashlib
+import io
+import json
 import os
-import boto3
+import re
+import sys
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from pathlib import Path
 
+import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
+
+try:
+    from PIL import Image, features
+except ImportError:  # sem Pillow só o original é enviado
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:  # sem numpy o manifest sai sem blurhash
+    np = None
+
 # Configuração
-s3_client = boto3.client('s3', region_name='us-east-1')
 POSTER_BUCKET = 'cinevision-capas'
+POSTER_PREFIX = 'posters/'
 MOVIES_DIR = r'E:\movies'
+WORKERS_PADRAO = 16
+MB = 1024 * 1024
+MULTIPART_THRESHOLD = 8 * MB
+MULTIPART_CHUNKSIZE = 8 * MB
+CACHE_HASHES = Path.home() / '.cache' / 'cinevision' / 'posters-hashes.json'
+MANIFEST_PADRAO = 'posters-manifest.json'
 
-# Lista de filmes para processar (excluindo Lilo & Stitch)
-movies = [
-    ('A Hora do Mal', 2025, r'E:\movies\FILME_ A Hora do Mal (2025)\POSTER.png'),
-    ('A Longa Marcha - Caminhe ou Morra', 2025, r'E:\movies\FILME_ A Longa Marcha - Caminhe ou Morra (2025)\POSTER.png'),
-    ('Como Treinar o Seu Dragão', 2025, r'E:\movies\FILME_ Como Treinar o Seu Dragão (2025)\POSTER.png'),
-    ('Demon Slayer - Castelo Infinito', 2025, r'E:\movies\FILME_ Demon Slayer - Castelo Infinito (2025)\POSTER.png'),
-    ('F1 - O Filme', 2025, r'E:\movies\FILME_ F1 - O Filme (2025)\POSTER.png'),
-    ('Invocação do Mal 4_ O Último Ritual', 2025, r'E:\movies\FILME_ Invocação do Mal 4_ O Último Ritual (2025)\POSTER.png'),
-    ('Jurassic World_ Recomeço', 2025, r'E:\movies\FILME_ Jurassic World_ Recomeço (2025)\POSTER.png'),
-    ('Quarteto Fantástico 4 - Primeiros Passos', 2025, r'E:\movies\FILME_ Quarteto Fantástico 4 - Primeiros Passos (2025)\POSTER.png'),
-    ('Superman', 2025, r'E:\movies\FILME_ Superman (2025)\POSTER.png'),
-]
+# Versões reduzidas: larguras em px (a altura segue a proporção do original)
+LARGURAS = (800, 400, 200)
+LARGURA_JPEG = 400
+# formato: (extensão, content type, opções do Pillow)
+FORMATOS = {
+    'webp': ('webp', 'image/webp', {'quality': 80, 'method': 4}),
+    'avif': ('avif', 'image/avif', {'quality': 55, 'speed': 8}),
+    'jpeg': ('jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+# Keys versionadas pelo hash do original: podem ficar em cache para sempre
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Blurhash (https://blurha.sh): componentes horizontais x verticais (poster é
+# retrato) calculados sobre uma miniatura de LARGURA_BLURHASH px
+COMPONENTES_BLURHASH = (3, 4)
+LARGURA_BLURHASH = 32
+BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+
+# Pastas da biblioteca: "FILME_ <título> (<ano>)", com um POSTER.png dentro
+PASTA_FILME = re.compile(r'^FILME_\s*(.+?)\s*\((\d{4})\)')
+POSTER_NOME = 'POSTER.PNG'
+EXCLUIDOS = {'Lilo & Stitch'}
 
-import re
 
-print('Iniciando upload de posters...\n')
+def descobrir_posters(pasta=MOVIES_DIR):
+    """
+    Gera (título, ano, caminho do poster) de cada filme da biblioteca, um
+    por vez conforme o os.scandir avança: o upload do primeiro começa antes
+    de a pasta inteira ser lida.
+    """
+    with os.scandir(pasta) as entradas:
+        for entrada in entradas:
+            if not entrada.is_dir():
+                continue
+            match = PASTA_FILME.match(entrada.name)
+            if not match or match.group(1) in EXCLUIDOS:
+                continue
+            with os.scandir(entrada.path) as arquivos:
+                poster = next((a.path for a in arquivos if a.is_file() and a.name.upper() == POSTER_NOME), None)
+            if poster is None:
+                print(f">> {match.group(1)} ({match.group(2)}) - sem {POSTER_NOME}, pulando\n")
+                continue
+            yield match.group(1), int(match.group(2)), poster
 
-for title, year, poster_path in movies:
-    # Gera o ID do filme
-    movie_id = f"{title.lower().replace(' ', '-').replace('_', '-')}"
+
+def gerar_movie_id(title, year):
+    # Acentos viram a letra base (ç -> c, ã -> a), como o slug do backend, em
+    # vez de sumirem: "Invocação" -> "invocacao", não "invocao"
+    sem_acentos = ''.join(
+        c for c in unicodedata.normalize('NFKD', title) if not unicodedata.combining(c)
+    )
+    movie_id = sem_acentos.lower().replace(' ', '-').replace('_', '-')
     # Remove caracteres especiais
     movie_id = re.sub(r'[^a-z0-9-]', '', movie_id)
-    movie_id = f"{movie_id}-{year}"
+    return f"{movie_id}-{year}"
+
+
+def transfer_config(workers):
+    # Posters passam pouco de alguns MB: abaixo de 8MB é um PUT só, acima
+    # vira multipart com as partes dividindo o mesmo pool
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        max_concurrency=workers,
+    )
+
+
+def etag_local(caminho):
+    """
+    O ETag que o S3 vai dar a este arquivo enviado com transfer_config: MD5
+    do conteúdo num PUT só, ou MD5 dos MD5 das partes + "-N" no multipart
+    """
+    md5s = []
+    with open(caminho, 'rb') as f:
+        while True:
+            bloco = f.read(MULTIPART_CHUNKSIZE)
+            if not bloco:
+                break
+            md5s.append(hashlib.md5(bloco))
+    if os.path.getsize(caminho) < MULTIPART_THRESHOLD:
+        return md5s[0].hexdigest() if md5s else hashlib.md5().hexdigest()
+    return f"{hashlib.md5(b''.join(m.digest() for m in md5s)).hexdigest()}-{len(md5s)}"
+
+
+class CacheHashes:
+    """ETag local de cada poster por (caminho, tamanho, mtime), salvo em JSON"""
+
+    def __init__(self, caminho=CACHE_HASHES):
+        self.caminho = Path(caminho)
+        self.alterado = False
+        try:
+            self._dados = json.loads(self.caminho.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self._dados = {}
+
+    def etag(self, poster_path):
+        info = os.stat(poster_path)
+        chave = os.path.abspath(poster_path)
+        guardado = self._dados.get(chave)
+        if (guardado and guardado['size'] == info.st_size and guardado['mtime_ns'] == info.st_mtime_ns
+                and guardado['chunksize'] == MULTIPART_CHUNKSIZE):
+            return guardado['etag']
+
+        etag = etag_local(poster_path)
+        self._dados[chave] = {
+            'size': info.st_size,
+            'mtime_ns': info.st_mtime_ns,
+            'chunksize': MULTIPART_CHUNKSIZE,
+            'etag': etag,
+        }
+        self.alterado = True
+        return etag
+
+    def salvar(self):
+        if not self.alterado:
+            return
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho.with_name(self.caminho.name + '.tmp')
+        temporario.write_text(json.dumps(self._dados, ensure_ascii=False), encoding='utf-8')
+        os.replace(temporario, self.caminho)
+
+
+def etags_remotos(s3_client, bucket=POSTER_BUCKET, prefixo=POSTER_PREFIX):
+    """{key: etag} de tudo sob prefixo, listado em páginas de 1000"""
+    etags = {}
+    for pagina in s3_client.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefixo):
+        for objeto in pagina.get('Contents', []):
+            etags[objeto['Key']] = objeto['ETag'].strip('"')
+    return etags
+
+
+def criar_cliente(workers):
+    """Client único e thread-safe; uma conexão HTTP mantida por worker"""
+    return boto3.client(
+        's3',
+        region_name='us-east-1',
+        config=Config(
+            max_pool_connections=workers,
+            retries={'max_attempts': 5, 'mode': 'adaptive'},
+            tcp_keepalive=True,
+        ),
+    )
+
+
+def _base83(valor, digitos):
+    return ''.join(BASE83[valor // 83 ** (digitos - i) % 83] for i in range(1, digitos + 1))
+
+
+def _linear(srgb):
+    """sRGB 0-255 -> luz linear 0-1 (array inteiro de uma vez)"""
+    v = srgb / 255.0
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+def _srgb(linear):
+    v = np.clip(linear, 0.0, 1.0)
+    return np.where(v <= 0.0031308, v * 12.92 * 255 + 0.5, (1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5).astype(int)
+
+
+def calcular_blurhash(imagem, componentes=COMPONENTES_BLURHASH):
+    """
+    Blurhash de uma imagem RGB do Pillow. Os coeficientes da transformada
+    cosseno saem de dois produtos de matriz sobre a miniatura inteira, sem
+    laço por pixel.
+    """
+    cx, cy = componentes
+    altura = max(1, round(imagem.height * LARGURA_BLURHASH / imagem.width))
+    miniatura = imagem.resize((LARGURA_BLURHASH, altura), Image.Resampling.BOX)
+    pixels = _linear(np.asarray(miniatura, dtype=np.float64))  # (altura, largura, 3)
+    h, w, _ = pixels.shape
 
-    s3_key = f"posters/{movie_id}.png"
+    base_x = np.cos(np.pi * np.outer(np.arange(cx), np.arange(w)) / w)  # (cx, w)
+    base_y = np.cos(np.pi * np.outer(np.arange(cy), np.arange(h)) / h)  # (cy, h)
+    fatores = np.einsum('jy,yxc,ix->jic', base_y, pixels, base_x) / (w * h)  # (cy, cx, 3)
+    fatores *= 2
+    fatores[0, 0] /= 2
 
+    dc = fatores[0, 0]
+    ac = fatores.reshape(-1, 3)[1:]
+
+    resultado = _base83((cx - 1) + (cy - 1) * 9, 1)
+    if len(ac):
+        quantizado = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        maximo = (quantizado + 1) / 166
+    else:
+        quantizado, maximo = 0, 1.0
+    resultado += _base83(quantizado, 1)
+
+    r, g, b = _srgb(dc)
+    resultado += _base83((int(r) << 16) + (int(g) << 8) + int(b), 4)
+
+    normalizado = np.sign(ac) * np.sqrt(np.abs(ac / maximo))
+    niveis = np.clip(np.floor(normalizado * 9 + 9.5), 0, 18).astype(int)  # (n, 3)
+    for r, g, b in niveis:
+        resultado += _base83(int(r) * 19 * 19 + int(g) * 19 + int(b), 2)
+    return resultado
+
+
+def gerar_derivados(poster_path, avif=False):
+    """
+    Roda no pool de processos: devolve (variantes, blurhash), com as versões
+    reduzidas do poster como dicts {largura, altura, formato, content_type,
+    dados}. Cada largura sai da anterior (800 -> 400 -> 200), que é bem
+    mais rápido que reduzir o original toda vez; o blurhash sai da menor.
+
+    Nunca amplia: as larguras que o original não alcança viram uma versão
+    só, no tamanho dele, e o JPEG sai na primeira versão de até
+    LARGURA_JPEG px.
+    """
+    with Image.open(poster_path) as original:
+        imagem = original.convert('RGB')
+
+    variantes = []
+    for largura in LARGURAS:
+        if largura < imagem.width:
+            altura = max(1, round(imagem.height * largura / imagem.width))
+            imagem = imagem.resize((largura, altura), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        elif variantes:
+            # Já saiu uma versão no tamanho original, que é <= largura
+            continue
+
+        com_jpeg = imagem.width <= LARGURA_JPEG and not any(v['formato'] == 'jpeg' for v in variantes)
+        formatos = ['webp'] + (['avif'] if avif else []) + (['jpeg'] if com_jpeg else [])
+        for formato in formatos:
+            _extensao, content_type, opcoes = FORMATOS[formato]
+            saida = io.BytesIO()
+            imagem.save(saida, format=formato.upper(), **opcoes)
+            variantes.append({
+                'largura': imagem.width,
+                'altura': imagem.height,
+                'formato': formato,
+                'content_type': content_type,
+                'dados': saida.getvalue(),
+            })
+
+    blurhash = calcular_blurhash(imagem) if np is not None else None
+    return variantes, blurhash
+
+
+def key_variante(movie_id, versao, variante):
+    extensao = FORMATOS[variante['formato']][0]
+    return f"{POSTER_PREFIX}{movie_id}/{versao}/{variante['largura']}.{extensao}"
+
+
+def ja_enviado(entrada, versao, remotos, avif=False):
+    """
+    Se a entrada do manifest é desta versão do poster e todas as versões
+    reduzidas dela (e o blurhash) já estão no bucket
+    """
+    variantes = entrada.get('variantes') or []
+    return (
+        entrada.get('versao') == versao
+        and bool(variantes)
+        and all(variante['key'] in remotos for variante in variantes)
+        and (not avif or any(variante['formato'] == 'avif' for variante in variantes))
+        # manifest de antes do blurhash: refaz para preencher
+        and (np is None or bool(entrada.get('blurhash')))
+    )
+
+
+def carregar_manifest(caminho):
+    try:
+        return json.loads(Path(caminho).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def salvar_manifest(caminho, manifest):
+    caminho = Path(caminho)
+    temporario = caminho.with_name(caminho.name + '.tmp')
+    temporario.write_text(json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(temporario, caminho)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Upload dos posters para o S3')
+    parser.add_argument('--pasta', default=MOVIES_DIR,
+                        help=f'Biblioteca de filmes (default: {MOVIES_DIR})')
+    parser.add_argument('--workers', '-w', type=int, default=WORKERS_PADRAO,
+                        help=f'Uploads simultâneos (default: {WORKERS_PADRAO})')
+    parser.add_argument('--sync', action='store_true',
+                        help='Só envia posters novos ou alterados (compara com os ETags do bucket)')
+    parser.add_argument('--cache-hashes', default=str(CACHE_HASHES),
+                        help=f'Cache dos hashes locais (default: {CACHE_HASHES})')
+    parser.add_argument('--sem-derivados', action='store_true',
+                        help='Envia só o POSTER.png original, sem as versões reduzidas')
+    parser.add_argument('--avif', action='store_true',
+                        help='Gera também AVIF em cada largura (menor que WebP, mas bem mais lento de gerar)')
+    parser.add_argument('--processos', type=int, default=os.cpu_count() or 1,
+                        help='Processos gerando as versões reduzidas (default: núcleos da máquina)')
+    parser.add_argument('--manifest', default=MANIFEST_PADRAO,
+                        help=f'JSON com as keys de cada poster (default: {MANIFEST_PADRAO})')
+    args = parser.parse_args(argv)
+    workers = max(1, args.workers)
+
+    derivados = not args.sem_derivados
+    if derivados and Image is None:
+        print('AVISO: Pillow não instalado (pip install Pillow), enviando só os originais\n')
+        derivados = False
+    if derivados and args.avif and not features.check('avif'):
+        print('AVISO: este Pillow não tem suporte a AVIF, gerando só WebP/JPEG\n')
+        args.avif = False
+    if derivados and np is None:
+        print('AVISO: numpy não instalado (pip install numpy), manifest sem blurhash\n')
+
+    print(f'Iniciando upload de posters ({workers} em paralelo)...\n')
+
+    s3_client = criar_cliente(workers)
+    ok = 0
+    total_bytes = 0
+    bytes_originais = 0
+    bytes_derivados = 0
+    falhas = []
+    sem_mudanca = 0
+    inicio = time.monotonic()
+
+    # O hash do original versiona as keys das reduzidas, então é calculado sempre
+    cache = CacheHashes(args.cache_hashes)
+    manifest = carregar_manifest(args.manifest)
+    remotos = None
+    if args.sync:
+        remotos = etags_remotos(s3_client)
+        print(f'{len(remotos)} objeto(s) já em s3://{POSTER_BUCKET}/{POSTER_PREFIX}\n')
+
+    def relatar(poster):
+        nonlocal ok, total_bytes, bytes_originais, bytes_derivados
+        print(f">> {poster['title']} ({poster['year']})")
+        print(f"   S3 Key: {poster['key']}")
+        try:
+            for future in poster['uploads']:
+                future.result()
+        except Exception as e:
+            print(f"   ERRO: {e}\n")
+            falhas.append((poster['title'], poster['year'], str(e)))
+            return
+
+        ok += 1
+        tamanho_variantes = sum(v['bytes'] for v in poster['variantes'])
+        total_bytes += poster['tamanho'] + tamanho_variantes
+        bytes_originais += poster['tamanho']
+        bytes_derivados += tamanho_variantes
+        print(f"   OK - {poster['tamanho'] / MB:.1f} MB", end='')
+        if poster['variantes']:
+            print(f" + {len(poster['variantes'])} versões reduzidas ({tamanho_variantes / 1024:.0f} KB)", end='')
+        print('\n')
+
+        manifest[poster['movie_id']] = {
+            'title': poster['title'],
+            'year': poster['year'],
+            'original': poster['key'],
+            'versao': poster['versao'],
+            'variantes': poster['variantes'],
+            'blurhash': poster['blurhash'],
+        }
+
+    def avancar(poster):
+        """Envia as reduzidas quando o pool termina; True quando tudo do poster acabou"""
+        if poster['derivados'] is not None:
+            if not poster['derivados'].done():
+                return False
+            try:
+                variantes, poster['blurhash'] = poster['derivados'].result()
+            except Exception as e:
+                variantes = []
+                poster['uploads'].append(_falha(e))
+            poster['derivados'] = None
+            for variante in variantes:
+                dados = variante.pop('dados')
+                variante['key'] = key_variante(poster['movie_id'], poster['versao'], variante)
+                variante['bytes'] = len(dados)
+                poster['variantes'].append(variante)
+                poster['uploads'].append(manager.upload(
+                    io.BytesIO(dados), POSTER_BUCKET, variante['key'],
+                    extra_args={'ContentType': variante['content_type'], 'CacheControl': CACHE_CONTROL},
+                ))
+        return all(future.done() for future in poster['uploads'])
+
+    # Posters ainda não relatados, na ordem da descoberta. Limitado para a
+    # descoberta não correr muito à frente do pool e dos uploads.
+    pendentes = deque()
+    limite = workers * 2
+
+    def escoar(maximo):
+        """
+        Envia as reduzidas de todo poster cujo pool já terminou (não só do
+        primeiro da fila) e relata, em ordem, os que acabaram, até sobrarem
+        no máximo maximo pendentes
+        """
+        while pendentes:
+            prontos = [avancar(poster) for poster in pendentes]
+            if prontos[0]:
+                relatar(pendentes.popleft())
+            elif len(pendentes) > maximo:
+                _esperar(pendentes)
+            else:
+                return
+    processos = ProcessPoolExecutor(max_workers=max(1, args.processos)) if derivados else None
     try:
-        # Upload para S3
-        print(f">> {title} ({year})")
-        print(f"   Arquivo: {poster_path}")
-        print(f"   S3 Key: {s3_key}")
+        with create_transfer_manager(s3_client, transfer_config(workers)) as manager:
+            for title, year, poster_path in descobrir_posters(args.pasta):
+                movie_id = gerar_movie_id(title, year)
+                s3_key = f"{POSTER_PREFIX}{movie_id}.png"
+                try:
+                    tamanho = os.path.getsize(poster_path)
+                    etag = cache.etag(poster_path)
+                except OSError as e:
+                    print(f">> {title} ({year})\n   ERRO: {e}\n")
+                    falhas.append((title, year, str(e)))
+                    continue
+
+                versao = etag[:12]
+                if remotos is not None and remotos.get(s3_key) == etag and (
+                    not derivados or ja_enviado(manifest.get(movie_id, {}), versao, remotos, args.avif)
+                ):
+                    sem_mudanca += 1
+                    continue
+
+                pendentes.append({
+                    'title': title,
+                    'year': year,
+                    'movie_id': movie_id,
+                    'key': s3_key,
+                    'tamanho': tamanho,
+                    'versao': versao,
+                    'variantes': [],
+                    'blurhash': None,
+                    'uploads': [manager.upload(poster_path, POSTER_BUCKET, s3_key, extra_args={'ContentType': 'image/png'})],
+                    'derivados': processos.submit(gerar_derivados, poster_path, args.avif) if processos else None,
+                })
+
+                escoar(limite)
+
+            escoar(0)
+    finally:
+        if processos:
+            processos.shutdown(cancel_futures=True)
+        cache.salvar()
+        if derivados:
+            salvar_manifest(args.manifest, manifest)
+
+    segundos = time.monotonic() - inicio
+    print('\n' + '=' * 60)
+    print(f'Posters enviados: {ok}/{ok + len(falhas)}')
+    if args.sync:
+        print(f'Sem mudança (pulados): {sem_mudanca}')
+    print(f'Total: {total_bytes / MB:.1f} MB em {segundos:.1f}s '
+          f'({total_bytes / MB / segundos if segundos else 0:.1f} MB/s, '
+          f'{ok / segundos if segundos else 0:.1f} posters/s)')
+    if derivados and bytes_originais:
+        print(f'Versões reduzidas: {bytes_derivados / MB:.1f} MB para {bytes_originais / MB:.1f} MB de originais '
+              f'(manifest em {args.manifest})')
+    if falhas:
+        print(f'\nFalhas ({len(falhas)}):')
+        for title, year, erro in falhas:
+            print(f'   {title} ({year}): {erro}')
+        return 1
+
+    print('\nUpload de posters concluido!')
+    return 0
+
+
+def _falha(erro):
+    """Future já concluído com erro, para a falha do pool entrar no relatório do poster"""
+    future = Future()
+    future.set_exception(erro)
+    return future
 
-        with open(poster_path, 'rb') as f:
-            s3_client.put_object(
-                Bucket=POSTER_BUCKET,
-                Key=s3_key,
-                Body=f,
-                ContentType='image/png'
-            )
 
-        print(f"   OK - Upload concluido\n")
+def _esperar(pendentes):
+    """
+    Bloqueia até o pool terminar as reduzidas de algum poster (para enviá-las
+    logo) ou, sem nenhuma no pool, até um upload do primeiro da fila acabar
+    """
+    gerando = [poster['derivados'] for poster in pendentes if poster['derivados'] is not None]
+    if gerando:
+        # Com timeout, para o primeiro da fila não esperar o pool para ser relatado
+        wait(gerando, timeout=0.1, return_when=FIRST_COMPLETED)
+        return
+    # Os futures do transfer manager não servem para wait(); o erro fica para relatar()
+    for future in pendentes[0]['uploads']:
+        if not future.done():
+            try:
+                future.result()
+            except Exception:
+                pass
+            return
 
-    except Exception as e:
-        print(f"   ERRO: {e}\n")
 
-print('\nUpload de posters concluido!')
+if __name__ == '__main__':
+    sys.exit(main())
@@ -26,6 +26,10 @@ import { VideoProcessorService } from '../../video/services/video-processor.serv
 import { LanguageType, LanguageCode } from '../entities/content-language.entity';
 import { SupabaseService } from '../../../config/supabase.service';
 
+const S3_MIN_PART_SIZE = 5 * 1024 * 1024;
+const S3_MAX_PART_SIZE = 5 * 1024 * 1024 * 1024;
+const S3_MAX_PARTS = 10000;
+
 export class CreateLanguageUploadDto {
   content_id: string;
   language_type: LanguageType;
@@ -39,6 +43,7 @@ export class InitiateLanguageUploadDto {
   file_name: string;
   file_size: number;
   content_type?: string; // Optional: 'video/mp4' or 'video/x-matroska'
+  chunk_size?: number; // Optional: part size chosen by the uploader (default 10MB)
 }
 
 export class InitiateUploadDto {
@@ -138,12 +143,21 @@ export class ContentLanguageUploadController {
       throw new BadRequestException(`Content type não suportado. Use 'video/mp4' ou 'video/x-matroska'`);
     }
 
+    // Validar tamanho das parts dentro dos limites do S3 (5MB-5GB, até 10.000 parts)
+    const chunkSize = initiateDto.chunk_size || 10 * 1024 * 1024; // 10MB chunks
+    if (chunkSize < S3_MIN_PART_SIZE || chunkSize > S3_MAX_PART_SIZE) {
+      throw new BadRequestException('chunk_size deve estar entre 5MB e 5GB');
+    }
+    if (Math.ceil(initiateDto.file_size / chunkSize) > S3_MAX_PARTS) {
+      throw new BadRequestException(`chunk_size gera mais de ${S3_MAX_PARTS} parts para este arquivo`);
+    }
+
     // Iniciar upload multipart usando o serviço existente
     const uploadResult = await this.videoUploadService.initiateMultipartUpload(
       storageKey,
       contentType,
       initiateDto.file_size,
-      10 * 1024 * 1024 // 10MB chunks
+      chunkSize
     );
 
     // Atualizar o idioma com a chave de armazenamento
@@ -158,6 +172,8 @@ export class ContentLanguageUploadController {
       key: uploadResult.key,
       content_language_id: initiateDto.content_language_id,
       storage_key: storageKey,
+      chunk_size: chunkSize,
+      total_parts: uploadResult.presignedUrls.length,
     };
   }
 
@@ -449,6 +465,33 @@ export class ContentLanguageUploadController {
     return { message: 'Upload abortado com sucesso' };
   }
 
+  @Post('list-parts')
+  @Roles(UserRole.ADMIN)
+  @HttpCode(HttpStatus.OK)
+  @ApiOperation({ summary: 'Listar partes já enviadas de um upload multipart' })
+  @ApiResponse({ status: 200, description: 'Partes listadas com sucesso' })
+  @ApiResponse({ status: 404, description: 'Upload multipart não existe mais (abortado ou expirado)' })
+  async listMultipartParts(
+    @Body() body: { content_language_id: string; upload_id: string }
+  ) {
+    const contentLanguage = await this.contentLanguageService.findById(body.content_language_id);
+
+    if (!contentLanguage.video_storage_key) {
+      throw new BadRequestException('Chave de armazenamento não encontrada');
+    }
+
+    const parts = await this.videoUploadService.listParts(
+      body.upload_id,
+      contentLanguage.video_storage_key
+    );
+
+    return {
+      upload_id: body.upload_id,
+      storage_key: contentLanguage.video_storage_key,
+      parts,
+    };
+  }
+
   @Get('public/video-url/:languageId')
   @ApiOperation({ summary: 'Get signed video URL for playback' })
   @ApiResponse({ status: 200, description: 'Signed video URL generated' })
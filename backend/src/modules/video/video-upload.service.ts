@@ -1,6 +1,6 @@
-import { Injectable, Logger } from '@nestjs/common';
+import { Injectable, Logger, NotFoundException } from '@nestjs/common';
 import { ConfigService } from '@nestjs/config';
-import { S3Client, CreateMultipartUploadCommand, UploadPartCommand, CompleteMultipartUploadCommand, AbortMultipartUploadCommand, PutObjectCommand, ListMultipartUploadsCommand, GetObjectCommand } from '@aws-sdk/client-s3';
+import { S3Client, CreateMultipartUploadCommand, UploadPartCommand, CompleteMultipartUploadCommand, AbortMultipartUploadCommand, PutObjectCommand, ListMultipartUploadsCommand, ListPartsCommand, GetObjectCommand } from '@aws-sdk/client-s3';
 import { getSignedUrl } from '@aws-sdk/s3-request-presigner';
 import { getSignedUrl as getCloudFrontSignedUrl } from 'aws-cloudfront-sign';
 import * as fs from 'fs';
@@ -12,6 +12,12 @@ export interface MultipartUploadResponse {
   presignedUrls: string[];
 }
 
+export interface UploadedPart {
+  PartNumber: number;
+  ETag: string;
+  Size: number;
+}
+
 export interface CompleteUploadRequest {
   uploadId: string;
   key: string;
@@ -155,6 +161,49 @@ export class VideoUploadService {
     }
   }
 
+  /**
+   * List parts already stored in S3 for a multipart upload (used to resume uploads)
+   */
+  async listParts(uploadId: string, key: string): Promise<UploadedPart[]> {
+    try {
+      const parts: UploadedPart[] = [];
+      let partNumberMarker: string | undefined;
+
+      do {
+        const listCommand = new ListPartsCommand({
+          Bucket: this.bucketName,
+          Key: key,
+          UploadId: uploadId,
+          PartNumberMarker: partNumberMarker,
+        });
+
+        const response = await this.s3Client.send(listCommand);
+
+        for (const part of response.Parts || []) {
+          parts.push({
+            PartNumber: part.PartNumber,
+            ETag: part.ETag,
+            Size: part.Size,
+          });
+        }
+
+        partNumberMarker = response.IsTruncated ? response.NextPartNumberMarker : undefined;
+      } while (partNumberMarker);
+
+      this.logger.log(`Listed ${parts.length} uploaded parts for ${key}`);
+
+      return parts;
+    } catch (error) {
+      // Upload aborted or expired: the client must start over, not retry
+      if (error.name === 'NoSuchUpload') {
+        this.logger.warn(`Multipart upload ${uploadId} not found for ${key}`);
+        throw new NotFoundException('Upload multipart não encontrado');
+      }
+      this.logger.error(`Failed to list multipart upload parts: ${error.message}`);
+      throw error;
+    }
+  }
+
   /**
    * Generate CloudFront signed URL for video streaming
    */
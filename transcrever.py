@@ -1,24 +1,104 @@
 #!/usr/bin/env python3
 """
 Transcrição de áudios/vídeos do Igor via Whisper.
-Uso: python transcrever.py arquivo1.mp4 [arquivo2.mp3 ...] [--modelo small|medium|large]
+Uso: python transcrever.py arquivo1.mp4 [arquivo2.mp3 ...] [--modelo small|medium|large] [--workers N]
+     [--engine whisper|faster-whisper]
+     python transcrever.py --benchmark [PASTA_DE_AMOSTRAS] [--benchmark-modelos tiny small medium]
+         [--benchmark-threads 2 4]
+     python transcrever.py --daemon [--modelo medium]   (mantém o modelo carregado; as
+         chamadas seguintes usam o daemon automaticamente)
+     python transcrever.py --watch PASTA   (transcreve cada arquivo novo que chegar na pasta)
+     python transcrever.py filme.mkv --streaming   (arquivos longos: memória constante)
 """
 
 import sys
 import os
 import argparse
+import importlib.util
 import re
+import subprocess
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
+from transcricao import CacheAudio, CacheTranscricoes, transcrever_todos
+from transcricao.audio import DECODIFICADORES_PADRAO, ffmpeg_disponivel
+from transcricao.benchmark import MODELOS, carregar_amostras, configuracoes, executar, gerar_corpus, tabela
+from transcricao.daemon import (
+    MODELOS_PADRAO, SOCKET_PADRAO, Daemon, ModelosCarregados, conectar, transcrever_no_daemon,
+)
+from transcricao.motores import DEPENDENCIAS, MOTOR_WHISPER, MOTORES, descricao
+from transcricao.saida import SaidaMarkdown, formatar_tempo
+from transcricao.cache import CACHE_PADRAO, TAMANHO_MAXIMO_PADRAO
+from transcricao.streaming import JANELA, transcrever_todos_em_fluxo
+from transcricao.vigia import ESPERA_ESTAVEL, FilaTranscricoes, vigiar
+
+
+def checar_dependencias(motores):
+    # Só verifica: o modelo é importado/carregado dentro de cada worker
+    for motor in motores:
+        modulo, pacote = DEPENDENCIAS[motor]
+        if importlib.util.find_spec(modulo) is None:
+            print(f"ERRO: {pacote} não instalado. Execute: pip install {pacote}")
+            sys.exit(1)
+
+
+def preparar_cache_audio(args, com_cache: bool):
+    """(pasta temporária ou None, CacheAudio ou None) para a pré-extração"""
+    if args.sem_pre_extracao:
+        return None, None
+    if not ffmpeg_disponivel():
+        print("[AVISO] ffmpeg não encontrado no PATH, sem pré-extração de áudio")
+        return None, None
+    # Áudio decodificado fica junto do cache; sem cache, numa pasta temporária
+    if com_cache:
+        return None, CacheAudio(Path(args.cache) / "audio")
+    pasta_temporaria = tempfile.TemporaryDirectory(prefix="transcrever-")
+    return pasta_temporaria, CacheAudio(pasta_temporaria.name)
+
+
+# Opções que o daemon no ar já fixou ao subir: numa chamada que usa o
+# daemon elas não têm efeito
+OPCOES_DO_DAEMON = {
+    "workers": "--workers",
+    "cache": "--cache",
+    "cache_max_mb": "--cache-max-mb",
+    "decodificadores": "--decodificadores",
+    "sem_pre_extracao": "--sem-pre-extracao",
+}
+
+
+def avisar_opcoes_do_daemon(args, parser):
+    ignoradas = [
+        opcao for destino, opcao in OPCOES_DO_DAEMON.items()
+        if getattr(args, destino) != parser.get_default(destino)
+    ]
+    if ignoradas:
+        print(f"[DAEMON] AVISO: {', '.join(ignoradas)} ignorado(s); o daemon usa as opções com que subiu "
+              f"(--sem-daemon transcreve neste processo)")
+
+
+def saida_do_dia(hoje: str) -> str:
+    return f"AJUSTES-IGOR-{hoje}-TRANSCRICAO.md"
+
+
+def relatar(caminho, resultado: dict):
+    if "vad" in resultado:
+        duracao, fala = resultado["vad"]["duracao"], resultado["vad"]["fala"]
+        silencio = 100 * (1 - fala / duracao) if duracao else 0
+        print(f"  [VAD] {formatar_tempo(fala)} de fala em {formatar_tempo(duracao)} ({silencio:.0f}% pulado)")
+    print(f"  -> {caminho.name}: {len(resultado['texto'])} caracteres transcritos")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Transcreve áudios/vídeos do Igor para texto")
-    parser.add_argument("arquivos", nargs="+", help="Arquivos de áudio ou vídeo")
+    parser.add_argument("arquivos", nargs="*", help="Arquivos de áudio ou vídeo")
     parser.add_argument(
         "--modelo", "-m",
-        choices=["tiny", "base", "small", "medium", "large", "turbo"],
+        choices=MODELOS,
         default="medium",
-        help="Modelo do Whisper (default: medium). 'large' é mais preciso, 'small' é mais rápido."
+        help="Modelo do Whisper (default: medium). 'large' é mais preciso, 'small' é mais rápido; "
+             "meça no seu hardware com --benchmark."
     )
     parser.add_argument(
         "--idioma", "-i",
@@ -34,101 +114,349 @@ def main():
         action="store_true",
         help="Incluir timestamps de cada segmento na transcrição"
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Arquivos transcritos em paralelo, um processo com o modelo carregado cada (default: 1). "
+             "Cada worker ocupa a memória de um modelo inteiro."
+    )
+    parser.add_argument(
+        "--cache",
+        default=str(CACHE_PADRAO),
+        help=f"Pasta do cache de transcrições (default: {CACHE_PADRAO})"
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=TAMANHO_MAXIMO_PADRAO // (1024 * 1024),
+        help="Tamanho máximo do cache; as transcrições usadas há mais tempo saem primeiro (default: 500)"
+    )
+    parser.add_argument(
+        "--sem-cache",
+        action="store_true",
+        help="Transcreve tudo de novo, sem ler nem gravar o cache"
+    )
+    parser.add_argument(
+        "--decodificadores",
+        type=int,
+        default=DECODIFICADORES_PADRAO,
+        help=f"Processos ffmpeg extraindo o áudio em paralelo (default: {DECODIFICADORES_PADRAO})"
+    )
+    parser.add_argument(
+        "--sem-pre-extracao",
+        action="store_true",
+        help="Não extrai o áudio antes; o Whisper decodifica cada arquivo na hora"
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Detecta os trechos com voz e só transcreve eles (pula silêncio longo; timestamps continuam os do original)"
+    )
+    parser.add_argument(
+        "--engine", "-e",
+        choices=MOTORES,
+        default=MOTOR_WHISPER,
+        help="Motor de inferência (default: whisper). 'faster-whisper' usa CTranslate2 com int8 na CPU, "
+             "bem mais rápido e leve que o PyTorch float32."
+    )
+    parser.add_argument(
+        "--benchmark",
+        nargs="?",
+        const="",
+        metavar="PASTA",
+        help="Mede cada modelo/motor/threads sobre os áudios da pasta (com .txt de referência de mesmo nome "
+             "para o WER) e grava a tabela comparativa. Sem PASTA, gera um corpus de frases com espeak-ng."
+    )
+    parser.add_argument(
+        "--benchmark-modelos",
+        nargs="+",
+        choices=MODELOS,
+        help="Modelos medidos no --benchmark (default: --modelo)"
+    )
+    parser.add_argument(
+        "--benchmark-threads",
+        nargs="+",
+        type=int,
+        help=f"Threads por configuração no --benchmark (default: {os.cpu_count() or 1})"
+    )
+    parser.add_argument(
+        "--benchmark-engines",
+        nargs="+",
+        choices=MOTORES,
+        default=list(MOTORES),
+        help="Motores comparados no --benchmark (default: todos)"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Sobe o daemon: carrega --modelo/--engine e fica esperando pedidos no socket"
+    )
+    parser.add_argument(
+        "--daemon-modelos",
+        type=int,
+        default=MODELOS_PADRAO,
+        help=f"Modelos mantidos em memória pelo daemon; o usado há mais tempo sai primeiro (default: {MODELOS_PADRAO})"
+    )
+    parser.add_argument(
+        "--socket",
+        default=str(SOCKET_PADRAO),
+        help=f"Socket Unix do daemon (default: $TRANSCREVER_SOCKET ou {SOCKET_PADRAO})"
+    )
+    parser.add_argument(
+        "--sem-daemon",
+        action="store_true",
+        help="Transcreve neste processo mesmo com um daemon no ar"
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help=f"Lê o áudio do ffmpeg em janelas de {JANELA:.0f}s e escreve cada segmento assim que sai: "
+             "memória constante em arquivos longos (filmes) e texto em segundos. "
+             "Roda neste processo, sem --workers, --vad nem pré-extração."
+    )
+    parser.add_argument(
+        "--watch",
+        metavar="PASTA",
+        help="Fica vigiando a pasta e transcreve cada áudio/vídeo novo para o AJUSTES-IGOR-<DATA>-TRANSCRICAO.md "
+             "do dia (ou --saida). A fila persiste entre execuções; o mesmo conteúdo nunca é transcrito duas vezes."
+    )
+    parser.add_argument(
+        "--watch-espera",
+        type=float,
+        default=ESPERA_ESTAVEL,
+        help=f"Segundos sem o arquivo crescer antes de entrar na fila (default: {ESPERA_ESTAVEL:.0f})"
+    )
     args = parser.parse_args()
 
-    try:
-        import whisper
-    except ImportError:
-        print("ERRO: openai-whisper não instalado. Execute: pip install openai-whisper")
-        sys.exit(1)
+    if args.daemon:
+        daemon(args)
+        return
 
-    # Define arquivo de saída
-    hoje = datetime.now().strftime("%Y-%m-%d")
-    saida_path = args.saida or f"AJUSTES-IGOR-{hoje}-TRANSCRICAO.md"
+    if args.watch:
+        vigiar_pasta(args)
+        return
 
-    print(f"[Whisper] Carregando modelo '{args.modelo}'...")
-    modelo = whisper.load_model(args.modelo)
+    if not args.arquivos and args.benchmark is None:
+        parser.error("informe os arquivos a transcrever (ou --benchmark PASTA)")
 
-    resultados = []
+    if args.benchmark is not None:
+        checar_dependencias(args.benchmark_engines)
+        benchmark(args)
+        return
+
+    # Define arquivo de saída
+    hoje = datetime.now().strftime("%Y-%m-%d")
+    saida_path = args.saida or saida_do_dia(hoje)
 
+    caminhos = []
     for arquivo in args.arquivos:
         caminho = Path(arquivo)
         if not caminho.exists():
             print(f"[AVISO] Arquivo não encontrado: {arquivo}")
             continue
+        caminhos.append(caminho)
 
-        print(f"\n[Whisper] Transcrevendo: {caminho.name} ...")
-        resultado = modelo.transcribe(
-            str(caminho),
-            language=args.idioma,
-            verbose=False,
+    # Cabeçalho já vai para o disco; cada seção entra assim que o arquivo termina
+    saida = SaidaMarkdown(
+        saida_path,
+        f"Transcrições Igor — {hoje}",
+        descricao(args.engine, args.modelo),
+        len(caminhos),
+        args.timestamps,
+    )
+
+    # Com o daemon no ar o modelo já está carregado; senão, tudo roda aqui
+    cache = None
+    pasta_temporaria = None
+    conexao = None if args.sem_daemon or args.streaming else conectar(args.socket)
+    if args.streaming:
+        checar_dependencias([args.engine])
+        if not ffmpeg_disponivel():
+            print("ERRO: --streaming precisa do ffmpeg no PATH")
+            saida.fechar()
+            os.remove(saida_path)
+            sys.exit(1)
+        if not args.sem_cache:
+            cache = CacheTranscricoes(args.cache, args.cache_max_mb * 1024 * 1024)
+        # Escreve segmento a segmento na saída; as seções já chegam prontas
+        resultados = transcrever_todos_em_fluxo(caminhos, args.modelo, args.idioma, saida, cache, args.engine)
+    elif conexao:
+        print(f"[DAEMON] Usando o daemon em {args.socket}")
+        avisar_opcoes_do_daemon(args, parser)
+        resultados = transcrever_no_daemon(
+            conexao, caminhos, args.modelo, args.idioma, args.vad, args.engine, not args.sem_cache
+        )
+    else:
+        checar_dependencias([args.engine])
+        if not args.sem_cache:
+            cache = CacheTranscricoes(args.cache, args.cache_max_mb * 1024 * 1024)
+        pasta_temporaria, cache_audio = preparar_cache_audio(args, cache is not None)
+        resultados = transcrever_todos(
+            caminhos,
+            args.modelo,
+            args.idioma,
+            args.workers,
+            cache,
+            cache_audio,
+            args.decodificadores,
+            args.vad,
+            args.engine,
         )
 
-        texto_completo = resultado["text"].strip()
-        segmentos = resultado.get("segments", [])
+    previas = []
 
-        print(f"  -> {len(texto_completo)} caracteres transcritos")
+    # Resultados chegam na ordem de entrada, mesmo com vários workers
+    try:
+        for caminho, resultado in resultados:
+            relatar(caminho, resultado)
+            if not args.streaming:
+                saida.secao(resultado)
 
-        resultados.append({
-            "arquivo": caminho.name,
-            "texto": texto_completo,
-            "segmentos": segmentos,
-        })
+            # Só a prévia fica em memória, não a transcrição inteira
+            texto = resultado["texto"]
+            previas.append((resultado["arquivo"], texto[:500] + ("..." if len(texto) > 500 else "")))
+    finally:
+        saida.fechar()
+        if cache:
+            cache.fechar()
+        if pasta_temporaria:
+            pasta_temporaria.cleanup()
 
-    if not resultados:
+    if not previas:
+        os.remove(saida_path)
         print("\nNenhum arquivo transcrito.")
         sys.exit(1)
 
-    # Monta markdown de saída
-    hora_geracao = datetime.now().strftime("%d/%m/%Y %H:%M")
-    linhas = [
-        f"# Transcrições Igor — {hoje}",
-        f"",
-        f"Gerado automaticamente via Whisper ({args.modelo}) em {hora_geracao}.",
-        f"{len(resultados)} arquivo(s) transcritos.",
-        "",
-        "---",
-        "",
-    ]
+    print(f"\n[OK] Transcrição salva em: {saida_path}")
+    print(f"\n{'='*60}")
+    print("PRÉVIA DA TRANSCRIÇÃO:")
+    print('='*60)
+    for arquivo, previa in previas:
+        print(f"\n[{arquivo}]")
+        print(previa)
+
+
+def daemon(args):
+    checar_dependencias([args.engine])
+    pasta_temporaria, cache_audio = preparar_cache_audio(args, not args.sem_cache)
+    servidor = Daemon(
+        args.socket,
+        None if args.sem_cache else args.cache,
+        args.cache_max_mb * 1024 * 1024,
+        cache_audio,
+        args.decodificadores,
+        args.daemon_modelos,
+    )
+    try:
+        # Já deixa o modelo padrão carregado para o primeiro pedido
+        servidor.servir(carregar=[(args.engine, args.modelo)])
+    except RuntimeError as erro:
+        print(f"ERRO: {erro}")
+        sys.exit(1)
+    finally:
+        if pasta_temporaria:
+            pasta_temporaria.cleanup()
+
+
+def vigiar_pasta(args):
+    if not Path(args.watch).is_dir():
+        print(f"ERRO: pasta não encontrada: {args.watch}")
+        sys.exit(1)
+    checar_dependencias([args.engine])
+
+    cache = None if args.sem_cache else CacheTranscricoes(args.cache, args.cache_max_mb * 1024 * 1024)
+    pasta_temporaria, cache_audio = preparar_cache_audio(args, cache is not None)
+    # A fila fica junto do cache mesmo com --sem-cache: é ela que evita transcrever duas vezes
+    fila = FilaTranscricoes(Path(args.cache) / "fila.db")
+    # Modelo carregado no primeiro arquivo e mantido até o fim
+    modelos = ModelosCarregados(1)
 
-    for idx, r in enumerate(resultados, start=1):
-        linhas.append(f"## Vídeo {idx} — `{r['arquivo']}`")
-        linhas.append("")
+    def processar(caminho):
+        # Data de cada arquivo: passando da meia-noite, começa o markdown do dia seguinte
+        hoje = datetime.now().strftime("%Y-%m-%d")
+        for caminho, resultado in transcrever_todos(
+            [caminho],
+            args.modelo,
+            args.idioma,
+            cache=cache,
+            cache_audio=cache_audio,
+            decodificadores=args.decodificadores,
+            vad=args.vad,
+            motor=args.engine,
+            modelos=modelos,
+        ):
+            relatar(caminho, resultado)
+            saida_path = args.saida or saida_do_dia(hoje)
+            saida = SaidaMarkdown(
+                saida_path,
+                f"Transcrições Igor — {hoje}",
+                descricao(args.engine, args.modelo),
+                None,
+                args.timestamps,
+                anexar=True,
+            )
+            try:
+                saida.secao(resultado)
+            finally:
+                saida.fechar()
+            print(f"  [OK] Seção {saida.secoes} em {saida_path}")
 
-        if args.timestamps and r["segmentos"]:
-            for seg in r["segmentos"]:
-                inicio = formatar_tempo(seg["start"])
-                texto_seg = seg["text"].strip()
-                linhas.append(f"**[{inicio}]** {texto_seg}")
-            linhas.append("")
+    try:
+        if cache:
+            vigiar(Path(args.watch), fila, processar, args.watch_espera, cache.hash_arquivo)
         else:
-            linhas.append(r["texto"])
-            linhas.append("")
+            vigiar(Path(args.watch), fila, processar, args.watch_espera)
+    finally:
+        fila.fechar()
+        if cache:
+            cache.fechar()
+        if pasta_temporaria:
+            pasta_temporaria.cleanup()
 
-        linhas.append("---")
-        linhas.append("")
 
-    conteudo = "\n".join(linhas)
+def benchmark(args):
+    if not ffmpeg_disponivel():
+        print("ERRO: o benchmark precisa do ffmpeg no PATH")
+        sys.exit(1)
 
-    with open(saida_path, "w", encoding="utf-8") as f:
-        f.write(conteudo)
+    pasta = args.benchmark
+    if not pasta:
+        pasta = Path(args.cache) / "benchmark-corpus"
+        try:
+            gerar_corpus(pasta, args.idioma)
+        except (RuntimeError, OSError, subprocess.CalledProcessError) as erro:
+            print(f"ERRO: {erro}")
+            sys.exit(1)
+        print(f"[BENCHMARK] Corpus gerado em {pasta}")
 
-    print(f"\n[OK] Transcrição salva em: {saida_path}")
-    print(f"\n{'='*60}")
-    print("PRÉVIA DA TRANSCRIÇÃO:")
-    print('='*60)
-    for r in resultados:
-        print(f"\n[{r['arquivo']}]")
-        print(r["texto"][:500] + ("..." if len(r["texto"]) > 500 else ""))
+    amostras = carregar_amostras(pasta)
+    if not amostras:
+        print(f"ERRO: nenhum áudio em {pasta}")
+        sys.exit(1)
+    if not all(referencia for _, referencia in amostras):
+        print("[AVISO] Nem todo áudio tem .txt de referência: sem WER, só concordância entre configurações")
 
+    grid = configuracoes(
+        args.benchmark_modelos or [args.modelo],
+        args.benchmark_engines,
+        args.benchmark_threads or [os.cpu_count() or 1],
+    )
+    linhas = executar(amostras, grid, args.idioma)
 
-def formatar_tempo(segundos: float) -> str:
-    m, s = divmod(int(segundos), 60)
-    h, m = divmod(m, 60)
-    if h:
-        return f"{h:02d}:{m:02d}:{s:02d}"
-    return f"{m:02d}:{s:02d}"
+    hoje = datetime.now().strftime("%Y-%m-%d")
+    saida_path = args.saida or f"BENCHMARK-TRANSCRICAO-{hoje}.md"
+    with open(saida_path, "w", encoding="utf-8") as f:
+        f.write(
+            f"# Benchmark de transcrição — {hoje}\n\n"
+            f"{len(amostras)} amostra(s) de `{pasta}`, {linhas[0]['duracao']:.0f}s de áudio, "
+            f"{os.cpu_count() or 1} núcleo(s). RTF = tempo de transcrição / duração do áudio "
+            "(abaixo de 1 é mais rápido que tempo real). Concordância é com a configuração mais precisa.\n\n"
+            f"{tabela(linhas)}"
+        )
 
+    print(f"\n{tabela(linhas)}")
+    print(f"[OK] Tabela salva em: {saida_path}")
 
 if __name__ == "__main__":
     main()
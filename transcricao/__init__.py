@@ -0,0 +1,24 @@
+"""
+Peças do transcrever.py: transcrição com Whisper em paralelo
+"""
+
+from .audio import CacheAudio, extrair_audio
+from .cache import CacheTranscricoes, hash_conteudo
+from .motores import MotorFasterWhisper, MotorWhisper, carregar_motor
+from .paralelo import carregar_modelo, transcrever_arquivo, transcrever_todos
+from .saida import SaidaMarkdown, formatar_tempo
+
+__all__ = [
+    "CacheAudio",
+    "CacheTranscricoes",
+    "MotorFasterWhisper",
+    "MotorWhisper",
+    "SaidaMarkdown",
+    "carregar_modelo",
+    "carregar_motor",
+    "extrair_audio",
+    "formatar_tempo",
+    "hash_conteudo",
+    "transcrever_arquivo",
+    "transcrever_todos",
+]
@@ -0,0 +1,134 @@
+"""
+Pré-extração do áudio: cada vídeo é decodificado uma vez para PCM 16 kHz
+mono (o formato que o Whisper usa) por subprocessos ffmpeg em paralelo,
+guardado como .npy e entregue ao modelo como array mapeado em memória
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+TAXA_AMOSTRAGEM = 16000
+TAMANHO_MAXIMO_PADRAO = 2 * 1024 * 1024 * 1024  # 2GB (~9h de áudio)
+DECODIFICADORES_PADRAO = min(4, os.cpu_count() or 1)
+BLOCO_PIPE = 1024 * 1024
+EXTENSOES_AUDIO = {".wav", ".mp3", ".m4a", ".ogg", ".opus", ".flac", ".mp4", ".mkv", ".mov", ".webm"}
+
+
+def ffmpeg_disponivel() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+def _cabecalho_npy(amostras: int) -> bytes:
+    cabecalho = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        cabecalho, {"descr": "<f4", "fortran_order": False, "shape": (amostras,)}
+    )
+    return cabecalho.getvalue()
+
+
+def _comando_ffmpeg(caminho):
+    return [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", str(caminho),
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(TAXA_AMOSTRAGEM),
+        "-",
+    ]
+
+
+def decodificar_audio(caminho) -> np.ndarray:
+    """Áudio inteiro em memória, no mesmo formato; para quando não há .npy pré-extraído"""
+    processo = subprocess.run(_comando_ffmpeg(caminho), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if processo.returncode != 0:
+        mensagem = processo.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"ffmpeg falhou em {Path(caminho).name}: {mensagem[-500:]}")
+    return np.frombuffer(processo.stdout, dtype=np.float32)
+
+
+def extrair_audio(caminho, destino):
+    """
+    Decodifica caminho para float32 16 kHz mono em destino (.npy). A saída do
+    ffmpeg vai direto para o arquivo; o cabeçalho é reescrito no fim com o
+    número de amostras (o tamanho dele não muda, é alinhado em 64 bytes).
+    """
+    destino = Path(destino)
+    temporario = destino.with_name(destino.name + ".tmp")
+    provisorio = _cabecalho_npy(0)
+    with open(temporario, "wb") as saida, tempfile.TemporaryFile() as erros:
+        saida.write(provisorio)
+        processo = subprocess.Popen(_comando_ffmpeg(caminho), stdout=subprocess.PIPE, stderr=erros)
+        shutil.copyfileobj(processo.stdout, saida, BLOCO_PIPE)
+        processo.stdout.close()
+        if processo.wait() != 0:
+            erros.seek(0)
+            mensagem = erros.read().decode("utf-8", "replace").strip()
+            saida.close()
+            os.remove(temporario)
+            raise RuntimeError(f"ffmpeg falhou em {Path(caminho).name}: {mensagem[-500:]}")
+
+        amostras = (saida.tell() - len(provisorio)) // 4
+        final = _cabecalho_npy(amostras)
+        if len(final) != len(provisorio):
+            raise RuntimeError("Cabeçalho .npy mudou de tamanho")
+        saida.seek(0)
+        saida.write(final)
+
+    os.replace(temporario, destino)
+    return destino
+
+
+def carregar_audio(caminho_npy):
+    """Array float32 mapeado em memória: só as páginas lidas pelo modelo entram na RAM"""
+    return np.load(caminho_npy, mmap_mode="r")
+
+
+class CacheAudio:
+    """
+    Pasta de .npy decodificados, um por (caminho, tamanho, mtime) do
+    original. Passando de tamanho_maximo bytes, os usados há mais tempo
+    são apagados.
+    """
+
+    def __init__(self, pasta, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        self.pasta = Path(pasta)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.tamanho_maximo = tamanho_maximo
+
+    def caminho_npy(self, caminho) -> Path:
+        info = os.stat(caminho)
+        identidade = f"{os.path.abspath(caminho)}|{info.st_size}|{info.st_mtime_ns}"
+        return self.pasta / f"{hashlib.sha256(identidade.encode('utf-8')).hexdigest()}.npy"
+
+    def obter(self, caminho) -> Path:
+        """Caminho do .npy de caminho, decodificando se ainda não existir"""
+        destino = self.caminho_npy(caminho)
+        if destino.exists():
+            os.utime(destino)
+            return destino
+        return extrair_audio(caminho, destino)
+
+    def limpar(self):
+        arquivos = sorted(self.pasta.glob("*.npy"), key=lambda arquivo: arquivo.stat().st_mtime)
+        total = sum(arquivo.stat().st_size for arquivo in arquivos)
+        for arquivo in arquivos:
+            if total <= self.tamanho_maximo:
+                break
+            total -= arquivo.stat().st_size
+            arquivo.unlink()
+
+
+def pre_extrair(caminhos, cache_audio: CacheAudio, decodificadores: int = DECODIFICADORES_PADRAO):
+    """
+    Dispara a decodificação de todos os arquivos e devolve (executor,
+    {caminho: Future do .npy}). Os futures ficam prontos em paralelo
+    enquanto o modelo já transcreve os primeiros.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, decodificadores), thread_name_prefix="ffmpeg")
+    return executor, {caminho: executor.submit(cache_audio.obter, caminho) for caminho in caminhos}
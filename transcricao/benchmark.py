@@ -0,0 +1,193 @@
+"""
+Benchmark de transcrição num conjunto fixo de amostras locais: cada
+combinação de modelo, motor e threads roda sobre os mesmos áudios e é
+medida em tempo de carga, fator de tempo real (RTF), pico de memória,
+taxa de erro por palavra (WER, quando há .txt de referência) e
+concordância com a configuração mais precisa
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from .audio import EXTENSOES_AUDIO, TAXA_AMOSTRAGEM, carregar_audio, extrair_audio
+from .motores import MOTOR_WHISPER, carregar_motor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Do menos para o mais preciso; o último do grid vira a referência de concordância
+MODELOS = ["tiny", "base", "small", "medium", "turbo", "large"]
+
+# Corpus gerado quando não há pasta de amostras: frases fixas sintetizadas
+# com espeak-ng, cada uma com a própria referência
+FRASES = [
+    "Bom dia, hoje vamos revisar os ajustes do catálogo de filmes.",
+    "O upload das capas precisa terminar antes da reunião de quinta-feira.",
+    "Confira se as legendas em português estão sincronizadas com o áudio.",
+    "A versão dublada do episódio três ainda não foi aprovada pelo cliente.",
+    "Depois de publicar, avise a equipe no grupo e atualize a planilha.",
+    "O servidor de transcodificação ficou lento ontem à noite, vamos investigar.",
+]
+
+
+def palavras(texto: str) -> list:
+    """Minúsculas e sem pontuação (acentos ficam), para o WER não contar vírgula como erro"""
+    return re.findall(r"\w+", texto.lower())
+
+
+def distancia_palavras(referencia: list, hipotese: list) -> int:
+    """Levenshtein por palavra: substituições + inserções + remoções"""
+    anterior = list(range(len(hipotese) + 1))
+    for i, palavra_ref in enumerate(referencia, 1):
+        atual = [i]
+        for j, palavra_hip in enumerate(hipotese, 1):
+            atual.append(min(
+                anterior[j] + 1,
+                atual[j - 1] + 1,
+                anterior[j - 1] + (palavra_ref != palavra_hip),
+            ))
+        anterior = atual
+    return anterior[-1]
+
+
+def wer(referencias, hipoteses) -> float:
+    """WER do conjunto: erros somados sobre palavras somadas, não média por arquivo"""
+    erros, total = 0, 0
+    for referencia, hipotese in zip(referencias, hipoteses):
+        esperadas = palavras(referencia)
+        erros += distancia_palavras(esperadas, palavras(hipotese))
+        total += len(esperadas)
+    return erros / total if total else 0.0
+
+
+def tts_disponivel():
+    return shutil.which("espeak-ng") or shutil.which("espeak")
+
+
+def gerar_corpus(pasta, idioma: str = "pt"):
+    """Sintetiza FRASES em pasta (.wav + .txt), se ainda não estiverem lá"""
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    tts = tts_disponivel()
+    if not tts:
+        raise RuntimeError("espeak-ng não encontrado para gerar o corpus; passe uma pasta de amostras")
+
+    # A equipe fala português do Brasil; a voz "pt" do espeak é a europeia
+    voz = "pt-br" if idioma == "pt" else idioma
+    for numero, frase in enumerate(FRASES, 1):
+        audio = pasta / f"frase{numero:02d}.wav"
+        if not audio.exists():
+            subprocess.run([tts, "-v", voz, "-w", str(audio), frase], check=True, capture_output=True)
+            audio.with_suffix(".txt").write_text(frase + "\n", encoding="utf-8")
+    return pasta
+
+
+def carregar_amostras(pasta):
+    """
+    Lista de (áudio, referência ou None) da pasta, em ordem de nome. A
+    referência é o .txt de mesmo nome.
+    """
+    amostras = []
+    for arquivo in sorted(Path(pasta).iterdir()):
+        if arquivo.suffix.lower() not in EXTENSOES_AUDIO:
+            continue
+        referencia = arquivo.with_suffix(".txt")
+        amostras.append((arquivo, referencia.read_text(encoding="utf-8") if referencia.exists() else None))
+    return amostras
+
+
+def _pico_rss_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB no Linux, bytes no macOS
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def _medir(motor: str, modelo: str, threads: int, idioma: str, audios: list) -> dict:
+    """Roda num processo novo por configuração: carga, threads e pico de RSS não se misturam"""
+    inicio = time.perf_counter()
+    transcritor = carregar_motor(motor, modelo, threads)
+    carga = time.perf_counter() - inicio
+
+    textos, tempo = [], 0.0
+    for audio in audios:
+        entrada = carregar_audio(audio)
+        inicio = time.perf_counter()
+        textos.append(transcritor.transcrever(entrada, idioma)["text"])
+        tempo += time.perf_counter() - inicio
+
+    return {"carga": carga, "tempo": tempo, "pico_rss_mb": _pico_rss_mb(), "textos": textos}
+
+
+def configuracoes(modelos, motores, threads) -> list:
+    """Grid (modelo, motor, threads), do modelo menos para o mais preciso"""
+    modelos = sorted(set(modelos), key=MODELOS.index)
+    return [(modelo, motor, n) for modelo in modelos for motor in motores for n in threads]
+
+
+def _referencia(grid):
+    """Configuração mais precisa do grid: maior modelo, motor original se houver, mais threads"""
+    return max(grid, key=lambda config: (MODELOS.index(config[0]), config[1] == MOTOR_WHISPER, config[2]))
+
+
+def executar(amostras, grid, idioma: str) -> list:
+    """
+    Mede cada configuração do grid sobre as amostras, decodificadas uma vez
+    antes (o ffmpeg não entra na conta), e devolve uma linha por
+    configuração: {modelo, motor, threads, carga, tempo, duracao, rtf,
+    pico_rss_mb, wer, concordancia}.
+    """
+    linhas = []
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as pasta:
+        audios = [
+            str(extrair_audio(arquivo, Path(pasta) / f"{numero}.npy"))
+            for numero, (arquivo, _) in enumerate(amostras)
+        ]
+        duracao = sum(len(carregar_audio(audio)) for audio in audios) / TAXA_AMOSTRAGEM
+        print(f"[BENCHMARK] {len(amostras)} amostra(s), {duracao:.0f}s de áudio, {len(grid)} configuração(ões)")
+
+        for modelo, motor, threads in grid:
+            print(f"[BENCHMARK] {modelo} / {motor} / {threads} thread(s)...")
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                medicao = executor.submit(_medir, motor, modelo, threads, idioma, audios).result()
+            linhas.append({
+                "modelo": modelo,
+                "motor": motor,
+                "threads": threads,
+                "duracao": duracao,
+                "rtf": medicao["tempo"] / duracao if duracao else 0.0,
+                **medicao,
+            })
+
+    referencias = [referencia for _, referencia in amostras]
+    base = next(linha for linha in linhas if (linha["modelo"], linha["motor"], linha["threads"]) == _referencia(grid))
+    for linha in linhas:
+        linha["wer"] = wer(referencias, linha["textos"]) if all(referencias) else None
+        linha["concordancia"] = max(0.0, 1 - wer(base["textos"], linha["textos"]))
+    return linhas
+
+
+def tabela(linhas) -> str:
+    """Tabela markdown com uma linha por configuração"""
+    texto = (
+        "| Modelo | Motor | Threads | Carga (s) | RTF | Pico RSS (MB) | WER | Concordância |\n"
+        "|---|---|---:|---:|---:|---:|---:|---:|\n"
+    )
+    for linha in linhas:
+        rss = f"{linha['pico_rss_mb']:.0f}" if linha["pico_rss_mb"] is not None else "—"
+        erro = f"{linha['wer']:.1%}" if linha["wer"] is not None else "—"
+        texto += (
+            f"| {linha['modelo']} | {linha['motor']} | {linha['threads']} | {linha['carga']:.1f} "
+            f"| {linha['rtf']:.2f} | {rss} | {erro} | {linha['concordancia']:.1%} |\n"
+        )
+    return texto
@@ -0,0 +1,125 @@
+"""
+Cache persistente de transcrições, por conteúdo do arquivo: rodar de novo
+sobre a mesma pasta devolve na hora o que já foi transcrito
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+CACHE_PADRAO = Path.home() / ".cache" / "transcrever"
+TAMANHO_MAXIMO_PADRAO = 500 * 1024 * 1024  # 500MB de transcrições
+BLOCO_HASH = 1024 * 1024
+
+
+def hash_conteudo(caminho) -> str:
+    """SHA-256 do arquivo lido em blocos (vídeos de vários GB não vão para a memória)"""
+    sha256 = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        while True:
+            bloco = f.read(BLOCO_HASH)
+            if not bloco:
+                break
+            sha256.update(bloco)
+    return sha256.hexdigest()
+
+
+class CacheTranscricoes:
+    """
+    SQLite com o resultado ({"texto", "segmentos"}) de cada transcrição, pela
+    chave (hash do conteúdo, modelo, idioma, opções). Passando de
+    tamanho_maximo bytes, as entradas usadas há mais tempo saem primeiro
+    (LRU).
+
+    O hash de cada arquivo também fica guardado por (caminho, tamanho,
+    mtime), então arquivos que não mudaram nem são relidos.
+    """
+
+    def __init__(self, pasta=CACHE_PADRAO, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        self.pasta = Path(pasta)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.tamanho_maximo = tamanho_maximo
+        self._db = sqlite3.connect(self.pasta / "transcricoes.db")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS transcricoes (
+                chave TEXT PRIMARY KEY,
+                resultado TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                usado_em REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS transcricoes_usado_em ON transcricoes (usado_em);
+            CREATE TABLE IF NOT EXISTS hashes (
+                caminho TEXT PRIMARY KEY,
+                tamanho INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+        """)
+        with self._db:
+            self._despejar()
+
+    def hash_arquivo(self, caminho) -> str:
+        caminho = os.path.abspath(caminho)
+        info = os.stat(caminho)
+        linha = self._db.execute(
+            "SELECT sha256 FROM hashes WHERE caminho = ? AND tamanho = ? AND mtime_ns = ?",
+            (caminho, info.st_size, info.st_mtime_ns),
+        ).fetchone()
+        if linha:
+            return linha[0]
+
+        sha256 = hash_conteudo(caminho)
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?)",
+                (caminho, info.st_size, info.st_mtime_ns, sha256),
+            )
+        return sha256
+
+    def chave(self, caminho, modelo: str, idioma: str, opcoes: dict = None) -> str:
+        partes = {
+            "sha256": self.hash_arquivo(caminho),
+            "modelo": modelo,
+            "idioma": idioma,
+            "opcoes": opcoes or {},
+        }
+        return hashlib.sha256(json.dumps(partes, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def obter(self, chave: str):
+        linha = self._db.execute("SELECT resultado FROM transcricoes WHERE chave = ?", (chave,)).fetchone()
+        if not linha:
+            return None
+        with self._db:
+            self._db.execute("UPDATE transcricoes SET usado_em = ? WHERE chave = ?", (time.time(), chave))
+        return json.loads(linha[0])
+
+    def guardar(self, chave: str, resultado: dict):
+        dados = json.dumps(
+            {"texto": resultado["texto"], "segmentos": resultado["segmentos"]},
+            ensure_ascii=False,
+        )
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO transcricoes VALUES (?, ?, ?, ?)",
+                (chave, dados, len(dados.encode("utf-8")), time.time()),
+            )
+            self._despejar()
+
+    def _despejar(self):
+        """Remove as entradas menos usadas recentemente até caber em tamanho_maximo"""
+        total = self._db.execute("SELECT COALESCE(SUM(tamanho), 0) FROM transcricoes").fetchone()[0]
+        if total <= self.tamanho_maximo:
+            return
+        for chave, tamanho in self._db.execute(
+            "SELECT chave, tamanho FROM transcricoes ORDER BY usado_em"
+        ).fetchall():
+            self._db.execute("DELETE FROM transcricoes WHERE chave = ?", (chave,))
+            total -= tamanho
+            if total <= self.tamanho_maximo:
+                break
+
+    def fechar(self):
+        self._db.close()
@@ -0,0 +1,198 @@
+"""
+Daemon de transcrição: mantém os modelos carregados entre uma chamada e
+outra do transcrever.py e recebe os pedidos por um socket Unix local.
+O transcrever.py vira cliente quando encontra o daemon no ar.
+
+Protocolo: uma linha JSON com o pedido; a resposta é uma linha JSON por
+arquivo transcrito ({"caminho", "resultado"}), na ordem do pedido, e uma
+linha final {"fim": true} ou {"erro": "..."}.
+"""
+
+import gc
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .cache import CACHE_PADRAO, TAMANHO_MAXIMO_PADRAO, CacheTranscricoes
+from .motores import MOTOR_WHISPER, carregar_motor
+from .paralelo import transcrever_todos
+
+SOCKET_PADRAO = Path(os.environ.get("TRANSCREVER_SOCKET", CACHE_PADRAO / "daemon.sock"))
+MODELOS_PADRAO = 2  # medium + large em float32 já passam de 7GB de RAM
+# Socket Unix não existe no Python do Windows: lá tudo roda no próprio processo
+SUPORTADO = hasattr(socket, "AF_UNIX")
+
+
+class ModelosCarregados:
+    """
+    Modelos residentes por (motor, nome). Passando de maximo, o usado há
+    mais tempo é descarregado (LRU).
+    """
+
+    def __init__(self, maximo: int = MODELOS_PADRAO):
+        self.maximo = max(1, maximo)
+        self._modelos = OrderedDict()
+
+    def obter(self, motor: str, nome: str):
+        chave = (motor, nome)
+        if chave in self._modelos:
+            self._modelos.move_to_end(chave)
+            return self._modelos[chave]
+
+        while len(self._modelos) >= self.maximo:
+            (motor_antigo, nome_antigo), _ = self._modelos.popitem(last=False)
+            print(f"[Whisper] Descarregando '{nome_antigo}' ({motor_antigo})")
+            gc.collect()
+
+        print(f"[Whisper] Carregando modelo '{nome}' ({motor})...")
+        self._modelos[chave] = carregar_motor(motor, nome)
+        return self._modelos[chave]
+
+
+class _Tratador(socketserver.StreamRequestHandler):
+    def _enviar(self, mensagem: dict):
+        self.wfile.write(json.dumps(mensagem, ensure_ascii=False, default=float).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def handle(self):
+        linha = self.rfile.readline()
+        # Conexão sem pedido: outro processo só conferindo se o daemon está no ar
+        if not linha.strip():
+            return
+        try:
+            pedido = json.loads(linha)
+            # Um pedido por vez: cada modelo já usa todos os núcleos
+            with self.server.trava:
+                for caminho, resultado in self.server.daemon.transcrever(pedido):
+                    self._enviar({"caminho": str(caminho), "resultado": resultado})
+            self._enviar({"fim": True})
+        except (BrokenPipeError, ConnectionResetError):
+            print("[DAEMON] Cliente desconectou, pedido cancelado")
+        except Exception as erro:
+            print(f"[DAEMON] ERRO: {erro}")
+            try:
+                self._enviar({"erro": f"{type(erro).__name__}: {erro}"})
+            except OSError:
+                pass
+
+
+if SUPORTADO:
+    class _Servidor(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class Daemon:
+    """
+    Servidor do socket. O cache de transcrições (SQLite) é aberto a cada
+    pedido, na thread que o atende; cache_audio e os modelos são do daemon
+    inteiro.
+    """
+
+    def __init__(
+        self,
+        caminho_socket=SOCKET_PADRAO,
+        pasta_cache=CACHE_PADRAO,
+        tamanho_cache=TAMANHO_MAXIMO_PADRAO,
+        cache_audio=None,
+        decodificadores: int = 1,
+        maximo_modelos: int = MODELOS_PADRAO,
+    ):
+        self.caminho_socket = Path(caminho_socket)
+        self.pasta_cache = pasta_cache
+        self.tamanho_cache = tamanho_cache
+        self.cache_audio = cache_audio
+        self.decodificadores = decodificadores
+        self.modelos = ModelosCarregados(maximo_modelos)
+
+    def transcrever(self, pedido: dict):
+        cache = None
+        if pedido.get("cache", True) and self.pasta_cache:
+            cache = CacheTranscricoes(self.pasta_cache, self.tamanho_cache)
+        try:
+            yield from transcrever_todos(
+                [Path(caminho) for caminho in pedido["arquivos"]],
+                pedido["modelo"],
+                pedido["idioma"],
+                cache=cache,
+                cache_audio=self.cache_audio,
+                decodificadores=self.decodificadores,
+                vad=pedido.get("vad", False),
+                motor=pedido.get("motor", MOTOR_WHISPER),
+                modelos=self.modelos,
+            )
+        finally:
+            if cache:
+                cache.fechar()
+
+    def servir(self, carregar=()):
+        """carregar: (motor, modelo) já deixados em memória antes do primeiro pedido"""
+        if not SUPORTADO:
+            raise RuntimeError("--daemon precisa de socket Unix, que esta plataforma não tem")
+        conexao = conectar(self.caminho_socket)
+        if conexao:
+            conexao.close()
+            raise RuntimeError(f"Já existe um daemon em {self.caminho_socket}")
+        # Socket de um daemon que morreu sem apagar o arquivo
+        if self.caminho_socket.exists():
+            self.caminho_socket.unlink()
+        self.caminho_socket.parent.mkdir(parents=True, exist_ok=True)
+
+        servidor = _Servidor(str(self.caminho_socket), _Tratador)
+        servidor.trava = threading.Lock()
+        servidor.daemon = self
+        os.chmod(self.caminho_socket, 0o600)
+        # kill também passa pelo finally e apaga o socket
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            # Pedidos que chegarem durante a carga esperam na fila do socket
+            for motor, nome in carregar:
+                self.modelos.obter(motor, nome)
+            print(f"[DAEMON] Ouvindo em {self.caminho_socket} (até {self.modelos.maximo} modelo(s) em memória)")
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            print("\n[DAEMON] Encerrando")
+        finally:
+            servidor.server_close()
+            self.caminho_socket.unlink(missing_ok=True)
+
+
+def conectar(caminho_socket=SOCKET_PADRAO):
+    """Socket conectado ao daemon, ou None se não houver daemon no ar"""
+    if not SUPORTADO:
+        return None
+    conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conexao.connect(str(caminho_socket))
+    except OSError:
+        conexao.close()
+        return None
+    return conexao
+
+
+def transcrever_no_daemon(conexao, caminhos, nome_modelo: str, idioma: str, vad=False, motor=MOTOR_WHISPER, cache=True):
+    """Mesmo contrato de transcrever_todos: gera (caminho, resultado) na ordem de entrada"""
+    caminhos = {str(Path(caminho).resolve()): Path(caminho) for caminho in caminhos}
+    pedido = {
+        "arquivos": list(caminhos),
+        "modelo": nome_modelo,
+        "idioma": idioma,
+        "vad": vad,
+        "motor": motor,
+        "cache": cache,
+    }
+    with conexao, conexao.makefile("rwb") as canal:
+        canal.write(json.dumps(pedido, ensure_ascii=False).encode("utf-8") + b"\n")
+        canal.flush()
+        for linha in canal:
+            mensagem = json.loads(linha)
+            if "erro" in mensagem:
+                raise RuntimeError(f"Daemon: {mensagem['erro']}")
+            if mensagem.get("fim"):
+                return
+            yield caminhos[mensagem["caminho"]], mensagem["resultado"]
+    raise RuntimeError("Daemon encerrou a conexão no meio do pedido")
@@ -0,0 +1,90 @@
+"""
+Motores de transcrição atrás de uma interface só: transcrever(entrada,
+idioma, prompt) devolve {"text", "segments"} no formato do openai-whisper,
+seja qual for a biblioteca por baixo. prompt é texto anterior dado como
+contexto ao decodificador (initial_prompt nas duas bibliotecas).
+"""
+
+import os
+
+MOTOR_WHISPER = "whisper"
+MOTOR_FASTER_WHISPER = "faster-whisper"
+MOTORES = (MOTOR_WHISPER, MOTOR_FASTER_WHISPER)
+
+# Módulo e pacote pip de cada motor, para checar a instalação sem importar
+DEPENDENCIAS = {
+    MOTOR_WHISPER: ("whisper", "openai-whisper"),
+    MOTOR_FASTER_WHISPER: ("faster_whisper", "faster-whisper"),
+}
+
+
+def _limitar_threads(threads: int):
+    # Precisa valer antes do torch/ctranslate2 ser importado (OpenMP/MKL leem na carga)
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+
+
+class MotorWhisper:
+    """openai-whisper em PyTorch float32 (o motor original do transcrever.py)"""
+
+    nome = MOTOR_WHISPER
+
+    def __init__(self, modelo: str, threads: int = None):
+        if threads:
+            _limitar_threads(threads)
+
+        import whisper
+
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+
+        self.modelo = whisper.load_model(modelo)
+
+    def transcrever(self, entrada, idioma: str, prompt: str = None) -> dict:
+        return self.modelo.transcribe(entrada, language=idioma, verbose=False, initial_prompt=prompt)
+
+
+class MotorFasterWhisper:
+    """
+    faster-whisper (CTranslate2) com pesos quantizados em int8 na CPU:
+    bem mais rápido que o PyTorch float32 e com uma fração da memória.
+    """
+
+    nome = MOTOR_FASTER_WHISPER
+    compute_type = "int8"
+
+    def __init__(self, modelo: str, threads: int = None):
+        if threads:
+            _limitar_threads(threads)
+
+        from faster_whisper import WhisperModel
+
+        self.modelo = WhisperModel(
+            modelo,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=threads or 0,
+        )
+
+    def transcrever(self, entrada, idioma: str, prompt: str = None) -> dict:
+        # Os segmentos vêm de um gerador: a decodificação acontece ao consumir
+        segmentos, _info = self.modelo.transcribe(entrada, language=idioma, initial_prompt=prompt)
+        segments = [
+            {"start": segmento.start, "end": segmento.end, "text": segmento.text}
+            for segmento in segmentos
+        ]
+        return {"text": "".join(segmento["text"] for segmento in segments), "segments": segments}
+
+
+def carregar_motor(nome: str, modelo: str, threads: int = None):
+    if nome == MOTOR_FASTER_WHISPER:
+        return MotorFasterWhisper(modelo, threads)
+    return MotorWhisper(modelo, threads)
+
+
+def descricao(nome: str, modelo: str) -> str:
+    """Como o motor aparece no cabeçalho do markdown"""
+    if nome == MOTOR_FASTER_WHISPER:
+        return f"{modelo}, faster-whisper {MotorFasterWhisper.compute_type}"
+    return modelo
@@ -0,0 +1,222 @@
+"""
+Transcrição de vários arquivos em paralelo: cada worker é um processo com o
+modelo carregado uma única vez e mantido em memória
+"""
+
+import functools
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from .audio import carregar_audio, decodificar_audio, pre_extrair
+from .motores import MOTOR_WHISPER, carregar_motor
+from .vad import AudioCompactado, regioes_de_fala
+
+# Motor carregado no processo worker (por _iniciar_worker)
+_modelo = None
+
+
+def threads_por_worker(workers: int) -> int:
+    """Divide os núcleos entre os workers para o PyTorch/CTranslate2 não disputar CPU"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def carregar_modelo(nome: str, threads: int = None, motor: str = MOTOR_WHISPER):
+    """Modelo nome no motor escolhido (ver motores.py)"""
+    return carregar_motor(motor, nome, threads)
+
+
+def opcoes_cache(vad: bool = False, motor: str = MOTOR_WHISPER, streaming: bool = False) -> dict:
+    """Opções que mudam o resultado e por isso entram na chave do cache"""
+    opcoes = {}
+    if vad:
+        opcoes["vad"] = True
+    if motor != MOTOR_WHISPER:
+        opcoes["motor"] = motor
+    if streaming:
+        opcoes["streaming"] = True
+    return opcoes
+
+
+def _resultado(caminho: Path, resultado: dict, tempo=None) -> dict:
+    tempo = tempo or (lambda segundos: segundos)
+    return {
+        "arquivo": caminho.name,
+        "texto": resultado["text"].strip(),
+        # Só o que a saída usa: o resultado volta do worker via pickle
+        "segmentos": [
+            {"start": tempo(seg["start"]), "end": tempo(seg["end"]), "text": seg["text"]}
+            for seg in resultado.get("segments", [])
+        ],
+    }
+
+
+def transcrever_arquivo(modelo, caminho, idioma: str, audio=None, vad: bool = False) -> dict:
+    """
+    audio é o .npy pré-extraído; sem ele o motor decodifica o arquivo com
+    ffmpeg. Com vad, só as regiões com fala vão para o modelo, concatenadas
+    numa passada só, e os timestamps voltam para a linha do tempo original.
+    """
+    caminho = Path(caminho)
+    entrada = carregar_audio(audio) if audio else str(caminho)
+    if not vad:
+        return _resultado(caminho, modelo.transcrever(entrada, idioma))
+
+    if not audio:
+        entrada = decodificar_audio(caminho)
+
+    compactado = AudioCompactado(entrada, regioes_de_fala(entrada))
+    if compactado.duracao_fala:
+        resultado = modelo.transcrever(compactado.audio, idioma)
+    else:
+        resultado = {"text": "", "segments": []}
+
+    transcricao = _resultado(caminho, resultado, compactado.tempo_original)
+    transcricao["vad"] = {"duracao": compactado.duracao_original, "fala": compactado.duracao_fala}
+    return transcricao
+
+
+def _iniciar_worker(nome_modelo: str, threads: int, motor: str):
+    global _modelo
+    _modelo = carregar_modelo(nome_modelo, threads, motor)
+
+
+def _transcrever_no_worker(caminho: str, idioma: str, audio: str = None, vad: bool = False) -> dict:
+    return transcrever_arquivo(_modelo, caminho, idioma, audio, vad)
+
+
+def _repassar(origem: Future, destino: Future):
+    if origem.cancelled():
+        destino.cancel()
+    elif origem.exception() is not None:
+        destino.set_exception(origem.exception())
+    else:
+        destino.set_result(origem.result())
+
+
+def _transcrever(
+    caminhos, nome_modelo: str, idioma: str, workers: int, audios=None, vad=False, motor=MOTOR_WHISPER, modelos=None
+):
+    """audios: {caminho: Future do .npy} da pré-extração, ou None"""
+    if not caminhos:
+        return
+
+    if modelos or workers <= 1 or len(caminhos) <= 1:
+        if modelos:
+            modelo = modelos.obter(motor, nome_modelo)
+        else:
+            print(f"[Whisper] Carregando modelo '{nome_modelo}' ({motor})...")
+            modelo = carregar_modelo(nome_modelo, motor=motor)
+        for caminho in caminhos:
+            audio = audios[caminho].result() if audios else None
+            print(f"\n[Whisper] Transcrevendo: {Path(caminho).name} ...")
+            yield caminho, transcrever_arquivo(modelo, caminho, idioma, audio, vad)
+        return
+
+    workers = min(workers, len(caminhos))
+    threads = threads_por_worker(workers)
+    print(f"[Whisper] {len(caminhos)} arquivo(s) em {workers} workers ({threads} thread(s) cada)")
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_iniciar_worker,
+        initargs=(nome_modelo, threads, motor),
+    ) as executor:
+        if not audios:
+            futuros = [
+                executor.submit(_transcrever_no_worker, str(caminho), idioma, None, vad)
+                for caminho in caminhos
+            ]
+            for caminho, futuro in zip(caminhos, futuros):
+                yield caminho, futuro.result()
+            return
+
+        # Cada arquivo entra no pool assim que o áudio dele fica pronto,
+        # na ordem em que o ffmpeg termina
+        futuros = {caminho: Future() for caminho in caminhos}
+
+        def enviar(caminho, futuro_audio):
+            try:
+                transcricao = executor.submit(
+                    _transcrever_no_worker, str(caminho), idioma, str(futuro_audio.result()), vad
+                )
+            except Exception as erro:
+                futuros[caminho].set_exception(erro)
+                return
+            transcricao.add_done_callback(functools.partial(_repassar, destino=futuros[caminho]))
+
+        for caminho in caminhos:
+            audios[caminho].add_done_callback(functools.partial(enviar, caminho))
+        for caminho in caminhos:
+            yield caminho, futuros[caminho].result()
+
+
+def transcrever_todos(
+    caminhos,
+    nome_modelo: str,
+    idioma: str,
+    workers: int = 1,
+    cache=None,
+    cache_audio=None,
+    decodificadores: int = 1,
+    vad: bool = False,
+    motor: str = MOTOR_WHISPER,
+    modelos=None,
+):
+    """
+    Transcreve os arquivos e gera (caminho, resultado) na ordem de entrada.
+
+    Com workers > 1 os arquivos são distribuídos entre processos; cada um
+    carrega o modelo na inicialização (memória de um modelo inteiro por
+    worker) e usa cpu_count / workers threads.
+
+    Com cache (CacheTranscricoes), arquivos já transcritos com o mesmo
+    modelo e idioma saem do cache sem carregar o modelo; os demais são
+    transcritos e guardados.
+
+    Com cache_audio (CacheAudio), o áudio dos pendentes é extraído antes por
+    decodificadores processos ffmpeg em paralelo, enquanto o modelo já
+    transcreve os primeiros.
+
+    vad corta o silêncio antes do modelo (ver transcrever_arquivo); entra na
+    chave do cache, assim como o motor quando não é o whisper original.
+
+    modelos (daemon.ModelosCarregados) reaproveita um modelo já em memória
+    em vez de carregar; nesse caso tudo roda neste processo, sem workers.
+    """
+    caminhos = list(caminhos)
+    chaves = {}
+    do_cache = {}
+    opcoes = opcoes_cache(vad, motor)
+
+    if cache:
+        for caminho in caminhos:
+            chaves[caminho] = cache.chave(caminho, nome_modelo, idioma, opcoes)
+            guardado = cache.obter(chaves[caminho])
+            if guardado:
+                do_cache[caminho] = {"arquivo": Path(caminho).name, **guardado}
+
+    pendentes = [caminho for caminho in caminhos if caminho not in do_cache]
+    if do_cache:
+        print(f"[CACHE] {len(do_cache)} arquivo(s) já transcritos, {len(pendentes)} para transcrever")
+
+    decodificacao, audios = None, None
+    if cache_audio and pendentes:
+        decodificacao, audios = pre_extrair(pendentes, cache_audio, decodificadores)
+
+    try:
+        # Os pendentes saem na mesma ordem relativa; intercala com os do cache
+        transcritos = _transcrever(pendentes, nome_modelo, idioma, workers, audios, vad, motor, modelos)
+        for caminho in caminhos:
+            if caminho in do_cache:
+                yield caminho, do_cache[caminho]
+                continue
+
+            caminho, resultado = next(transcritos)
+            if cache:
+                cache.guardar(chaves[caminho], resultado)
+            yield caminho, resultado
+    finally:
+        if decodificacao:
+            decodificacao.shutdown(cancel_futures=True)
+            cache_audio.limpar()
@@ -0,0 +1,93 @@
+"""
+Markdown de saída gravado aos poucos: o cabeçalho na abertura e cada
+"## Vídeo N" assim que o arquivo termina, com flush, para um erro no meio do
+lote não perder o que já foi transcrito
+"""
+
+import os
+from datetime import datetime
+
+
+def formatar_tempo(segundos: float) -> str:
+    m, s = divmod(int(segundos), 60)
+    h, m = divmod(m, 60)
+    if h:
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return f"{m:02d}:{s:02d}"
+
+
+class SaidaMarkdown:
+    """
+    Arquivo de transcrições aberto durante todo o lote. Uma seção pode ser
+    escrita inteira (secao) ou em partes, segmento a segmento, para motores
+    que entregam os segmentos conforme decodificam (abrir_secao, segmento,
+    fechar_secao). Nada fica acumulado em memória.
+
+    Com anexar, um arquivo que já existe recebe as seções novas no fim (a
+    numeração continua) em vez de ser sobrescrito; total=None omite a
+    contagem da fila no cabeçalho.
+    """
+
+    def __init__(self, caminho, titulo: str, modelo: str, total, timestamps: bool = False, anexar: bool = False):
+        self.caminho = caminho
+        self.timestamps = timestamps
+        self.secoes = 0
+        self._inicio_texto = True
+        self._linha_aberta = False
+
+        if anexar and os.path.exists(caminho) and os.path.getsize(caminho):
+            with open(caminho, encoding="utf-8") as existente:
+                self.secoes = sum(1 for linha in existente if linha.startswith("## Vídeo "))
+            self._arquivo = open(caminho, "a", encoding="utf-8")
+            return
+
+        self._arquivo = open(caminho, "w", encoding="utf-8")
+        hora_geracao = datetime.now().strftime("%d/%m/%Y %H:%M")
+        self._escrever(
+            f"# {titulo}\n"
+            "\n"
+            f"Gerado automaticamente via Whisper ({modelo}) em {hora_geracao}.\n"
+            + (f"{total} arquivo(s) na fila.\n" if total is not None else "")
+            + "\n"
+            "---\n"
+            "\n"
+        )
+
+    def _escrever(self, texto: str):
+        self._arquivo.write(texto)
+        self._arquivo.flush()
+
+    def abrir_secao(self, arquivo: str):
+        self.secoes += 1
+        self._inicio_texto = True
+        self._linha_aberta = False
+        self._escrever(f"## Vídeo {self.secoes} — `{arquivo}`\n\n")
+
+    def segmento(self, segmento: dict):
+        if self.timestamps:
+            self._escrever(f"**[{formatar_tempo(segmento['start'])}]** {segmento['text'].strip()}\n")
+            self._linha_aberta = False
+            return
+
+        # Sem timestamps os segmentos formam um parágrafo só, como o "text" do Whisper
+        texto = segmento["text"].lstrip() if self._inicio_texto else segmento["text"]
+        self._inicio_texto = False
+        self._linha_aberta = True
+        self._escrever(texto)
+
+    def fechar_secao(self):
+        self._escrever(("\n" if self._linha_aberta else "") + "\n---\n\n")
+
+    def secao(self, resultado: dict):
+        """Escreve a seção de um resultado completo ({"arquivo", "texto", "segmentos"})"""
+        self.abrir_secao(resultado["arquivo"])
+        if self.timestamps and resultado["segmentos"]:
+            for segmento in resultado["segmentos"]:
+                self.segmento(segmento)
+        else:
+            self._escrever(resultado["texto"])
+            self._linha_aberta = True
+        self.fechar_secao()
+
+    def fechar(self):
+        self._arquivo.close()
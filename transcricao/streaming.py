@@ -0,0 +1,151 @@
+"""
+Transcrição em janelas direto do pipe do ffmpeg: o áudio nunca fica
+inteiro na memória (um filme de 2h viraria ~460MB de float32) e os
+primeiros segmentos saem em segundos
+"""
+
+import subprocess
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .audio import TAXA_AMOSTRAGEM, _comando_ffmpeg
+from .motores import MOTOR_WHISPER
+from .paralelo import carregar_modelo, opcoes_cache
+from .saida import formatar_tempo
+
+JANELA = 30.0  # o Whisper processa 30s por vez de qualquer jeito
+MARGEM_FINAL = 1.0  # segmento que termina a menos disso do fim da janela pode estar cortado
+SOBREPOSICAO = 1.0  # janela sem fala avança deixando esse tanto para a próxima
+AVANCO_MINIMO = 1.0
+CONTEXTO_CARACTERES = 200  # texto anterior passado como prompt (~50 tokens)
+
+
+class _PipeFfmpeg:
+    """PCM float32 16 kHz mono lido do stdout do ffmpeg, n amostras por vez"""
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        self._erros = tempfile.TemporaryFile()
+        self._processo = subprocess.Popen(_comando_ffmpeg(caminho), stdout=subprocess.PIPE, stderr=self._erros)
+
+    def ler(self, amostras: int) -> np.ndarray:
+        # read(n) no pipe bloqueia até ter n bytes ou o ffmpeg terminar
+        dados = self._processo.stdout.read(amostras * 4)
+        return np.frombuffer(dados[:len(dados) - len(dados) % 4], dtype=np.float32)
+
+    def fechar(self, interrompido: bool = False):
+        if interrompido:
+            self._processo.kill()
+        self._processo.stdout.close()
+        codigo = self._processo.wait()
+        self._erros.seek(0)
+        mensagem = self._erros.read().decode("utf-8", "replace").strip()
+        self._erros.close()
+        if codigo != 0 and not interrompido:
+            raise RuntimeError(f"ffmpeg falhou em {self.caminho.name}: {mensagem[-500:]}")
+
+
+def transcrever_em_fluxo(modelo, caminho, idioma: str, janela: float = JANELA):
+    """
+    Gera os segmentos ({"start", "end", "text"}, no tempo do arquivo) de
+    caminho conforme cada janela é transcrita.
+
+    Só os segmentos que terminam antes de MARGEM_FINAL do fim da janela são
+    confirmados; a janela seguinte começa no fim do último confirmado (como
+    o seek do próprio Whisper), então uma fala cortada na borda é refeita
+    inteira. O texto confirmado vai como prompt da próxima janela, para
+    manter nomes e pontuação entre uma e outra. Em memória fica só a janela
+    atual.
+    """
+    tamanho = int(janela * TAXA_AMOSTRAGEM)
+    pipe = _PipeFfmpeg(caminho)
+    buffer = np.zeros(0, dtype=np.float32)
+    inicio = 0.0  # tempo, no arquivo, da primeira amostra do buffer
+    contexto = ""
+    acabou = False
+
+    try:
+        while True:
+            if not acabou and len(buffer) < tamanho:
+                novo = pipe.ler(tamanho - len(buffer))
+                acabou = len(novo) < tamanho - len(buffer)
+                buffer = np.concatenate((buffer, novo))
+            if not len(buffer):
+                break
+
+            segmentos = modelo.transcrever(buffer, idioma, prompt=contexto or None)["segments"]
+            duracao = len(buffer) / TAXA_AMOSTRAGEM
+            if acabou:
+                confirmados = segmentos
+            else:
+                # Um segmento longo que encosta no fim ainda entra, senão a janela não anda
+                confirmados = (
+                    [seg for seg in segmentos if seg["end"] <= duracao - MARGEM_FINAL]
+                    or segmentos[:-1]
+                    or segmentos
+                )
+
+            for seg in confirmados:
+                yield {"start": inicio + seg["start"], "end": inicio + seg["end"], "text": seg["text"]}
+            if acabou:
+                break
+
+            avanco = confirmados[-1]["end"] if confirmados else duracao - SOBREPOSICAO
+            corte = int(min(duracao, max(avanco, AVANCO_MINIMO)) * TAXA_AMOSTRAGEM)
+            buffer = buffer[corte:]
+            inicio += corte / TAXA_AMOSTRAGEM
+            contexto = (contexto + "".join(seg["text"] for seg in confirmados))[-CONTEXTO_CARACTERES:]
+    except BaseException:
+        pipe.fechar(interrompido=True)
+        raise
+
+    pipe.fechar()
+
+
+def transcrever_todos_em_fluxo(caminhos, nome_modelo: str, idioma: str, saida, cache=None, motor=MOTOR_WHISPER):
+    """
+    Como transcrever_todos, mas em janelas e num processo só: cada segmento
+    vai para saida (SaidaMarkdown) e para o console assim que sai do
+    modelo. Gera (caminho, resultado) ao fim de cada arquivo, com a seção
+    já escrita; os do cache são escritos inteiros.
+    """
+    opcoes = opcoes_cache(motor=motor, streaming=True)
+    modelo = None
+    for caminho in caminhos:
+        chave = cache.chave(caminho, nome_modelo, idioma, opcoes) if cache else None
+        guardado = cache.obter(chave) if cache else None
+        if guardado:
+            print(f"[CACHE] {Path(caminho).name} já transcrito")
+            resultado = {"arquivo": Path(caminho).name, **guardado}
+            saida.secao(resultado)
+            yield caminho, resultado
+            continue
+
+        if modelo is None:
+            print(f"[Whisper] Carregando modelo '{nome_modelo}' ({motor})...")
+            modelo = carregar_modelo(nome_modelo, motor=motor)
+
+        print(f"\n[Whisper] Transcrevendo em janelas de {JANELA:.0f}s: {Path(caminho).name} ...")
+        # Só os segmentos (texto) ficam guardados, para o cache; o áudio não
+        segmentos = []
+        for segmento in transcrever_em_fluxo(modelo, caminho, idioma):
+            # Seção aberta no primeiro segmento: se o ffmpeg falhar logo de cara, nada fica pela metade
+            if not segmentos:
+                saida.abrir_secao(Path(caminho).name)
+            saida.segmento(segmento)
+            segmentos.append(segmento)
+            print(f"  [{formatar_tempo(segmento['start'])}] {segmento['text'].strip()}")
+        if not segmentos:
+            saida.abrir_secao(Path(caminho).name)
+        saida.fechar_secao()
+
+        resultado = {
+            "arquivo": Path(caminho).name,
+            "texto": "".join(segmento["text"] for segmento in segmentos).strip(),
+            "segmentos": segmentos,
+        }
+        if cache:
+            cache.guardar(chave, resultado)
+        yield caminho, resultado
@@ -0,0 +1,98 @@
+"""
+Detecção de voz por energia: corta o áudio nas regiões com fala para o
+modelo não gastar tempo com silêncio, e devolve os timestamps para a linha
+do tempo original
+"""
+
+import bisect
+
+import numpy as np
+
+from .audio import TAXA_AMOSTRAGEM
+
+QUADRO = int(0.03 * TAXA_AMOSTRAGEM)  # quadros de 30ms
+BLOCO = 60 * TAXA_AMOSTRAGEM  # energia calculada de minuto em minuto (memória constante)
+
+DB_ACIMA_DO_RUIDO = 12.0  # fala = quadros 12 dB acima do piso de ruído (nunca menos que DB_MINIMO)...
+DB_ABAIXO_DO_PICO = 10.0  # ...ou 10 dB abaixo dos trechos mais altos, em gravação sem pausas
+DB_MINIMO = -55.0  # piso do limiar por ruído, para gravação muito limpa
+DB_SILENCIO = -70.0  # abaixo disso nunca é fala, nem com o limiar por pico
+SILENCIO_MINIMO = 1.0  # pausas menores que isso ficam dentro da região
+MARGEM = 0.2  # folga antes/depois de cada região, para não cortar sílabas
+REGIAO_MINIMA = 0.25
+PAUSA_ENTRE_REGIOES = 0.3  # silêncio mantido entre regiões no áudio compactado
+
+
+def energia_db(audio) -> np.ndarray:
+    """Energia (dBFS) de cada quadro de QUADRO amostras"""
+    quadros = len(audio) // QUADRO
+    energia = np.empty(quadros, dtype=np.float32)
+    por_bloco = BLOCO // QUADRO
+    for inicio in range(0, quadros, por_bloco):
+        fim = min(quadros, inicio + por_bloco)
+        trecho = np.asarray(audio[inicio * QUADRO:fim * QUADRO], dtype=np.float32).reshape(-1, QUADRO)
+        energia[inicio:fim] = 10 * np.log10(np.mean(trecho * trecho, axis=1) + 1e-10)
+    return energia
+
+
+def regioes_de_fala(audio, silencio_minimo=SILENCIO_MINIMO, margem=MARGEM):
+    """Lista de (início, fim) em amostras dos trechos com fala"""
+    energia = energia_db(audio)
+    if not len(energia):
+        return []
+
+    piso = float(np.percentile(energia, 10))
+    limiar = max(piso + DB_ACIMA_DO_RUIDO, DB_MINIMO)
+    # Trechos altos = os que já passam do limiar por ruído; com pouca fala
+    # (menos de 5% da gravação) o percentil 95 da gravação inteira ainda é
+    # o ruído, e o limiar iria para baixo dele. Sem nenhum trecho acima, a
+    # gravação não tem pausa para servir de piso e vale o percentil geral.
+    altos = energia[energia > limiar]
+    pico = float(np.percentile(altos if len(altos) else energia, 95))
+    limiar = max(min(limiar, pico - DB_ABAIXO_DO_PICO), DB_SILENCIO)
+    fala = energia > limiar
+
+    # Bordas de subida/descida da máscara de fala, em quadros
+    bordas = np.flatnonzero(np.diff(np.concatenate(([0], fala.astype(np.int8), [0]))))
+    regioes = []
+    folga = int(margem * TAXA_AMOSTRAGEM)
+    for inicio, fim in zip(bordas[::2], bordas[1::2]):
+        inicio = max(0, int(inicio) * QUADRO - folga)
+        fim = min(len(audio), int(fim) * QUADRO + folga)
+        if regioes and inicio - regioes[-1][1] < silencio_minimo * TAXA_AMOSTRAGEM:
+            regioes[-1] = (regioes[-1][0], fim)
+        else:
+            regioes.append((inicio, fim))
+
+    return [(inicio, fim) for inicio, fim in regioes if fim - inicio >= REGIAO_MINIMA * TAXA_AMOSTRAGEM]
+
+
+class AudioCompactado:
+    """
+    Regiões de fala concatenadas (com uma pausa curta entre elas) num array
+    só, que o modelo transcreve de uma vez, mais a tabela para converter um
+    tempo do áudio compactado de volta para o original.
+    """
+
+    def __init__(self, audio, regioes):
+        pausa = np.zeros(int(PAUSA_ENTRE_REGIOES * TAXA_AMOSTRAGEM), dtype=np.float32)
+        partes = []
+        self._inicio_compactado = []
+        self._inicio_original = []
+        posicao = 0
+        for inicio, fim in regioes:
+            if partes:
+                partes.append(pausa)
+                posicao += len(pausa)
+            self._inicio_compactado.append(posicao / TAXA_AMOSTRAGEM)
+            self._inicio_original.append(inicio / TAXA_AMOSTRAGEM)
+            partes.append(np.asarray(audio[inicio:fim], dtype=np.float32))
+            posicao += fim - inicio
+
+        self.audio = np.concatenate(partes) if partes else np.zeros(0, dtype=np.float32)
+        self.duracao_original = len(audio) / TAXA_AMOSTRAGEM
+        self.duracao_fala = len(self.audio) / TAXA_AMOSTRAGEM
+
+    def tempo_original(self, segundos: float) -> float:
+        indice = max(0, bisect.bisect_right(self._inicio_compactado, segundos) - 1)
+        return self._inicio_original[indice] + (segundos - self._inicio_compactado[indice])
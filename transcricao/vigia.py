@@ -0,0 +1,253 @@
+"""
+Modo --watch: vigia uma pasta, espera cada arquivo novo parar de crescer e
+põe na fila; a fila fica num SQLite, então sobrevive a reinícios e nada é
+transcrito duas vezes nem perdido
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sqlite3
+import struct
+import time
+from pathlib import Path
+
+from .audio import EXTENSOES_AUDIO
+from .cache import hash_conteudo
+
+ESPERA_ESTAVEL = 5.0  # segundos sem mudar de tamanho para considerar a cópia terminada
+INTERVALO = 1.0  # de quanto em quanto tempo confere os candidatos (e varre a pasta, sem inotify)
+
+# inotify(7): só os eventos que indicam arquivo novo ou crescendo
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+_EVENTO = struct.Struct("iIII")
+
+PENDENTE, FEITO, ERRO = "pendente", "feito", "erro"
+
+
+def _eh_midia(caminho: Path) -> bool:
+    return caminho.suffix.lower() in EXTENSOES_AUDIO and not caminho.name.startswith(".")
+
+
+def varrer(pasta) -> list:
+    with os.scandir(pasta) as entradas:
+        return [Path(entrada.path) for entrada in entradas if entrada.is_file() and _eh_midia(Path(entrada.name))]
+
+
+class ObservadorInotify:
+    """inotify via libc (Linux), sem dependência extra. Só o primeiro nível da pasta."""
+
+    def __init__(self, pasta):
+        self.pasta = Path(pasta)
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        mascara = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self._fd, os.fsencode(self.pasta), mascara) < 0:
+            erro = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(erro, f"inotify_add_watch falhou em {self.pasta}")
+
+    def esperar(self, timeout: float) -> set:
+        """Arquivos com evento nos próximos timeout segundos"""
+        alterados = set()
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return alterados
+        while True:
+            try:
+                dados = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return alterados
+            posicao = 0
+            while posicao < len(dados):
+                _wd, _mascara, _cookie, tamanho = _EVENTO.unpack_from(dados, posicao)
+                posicao += _EVENTO.size
+                nome = dados[posicao:posicao + tamanho].rstrip(b"\0")
+                posicao += tamanho
+                if nome:
+                    caminho = self.pasta / os.fsdecode(nome)
+                    if _eh_midia(caminho):
+                        alterados.add(caminho)
+
+    def fechar(self):
+        os.close(self._fd)
+
+
+class ObservadorVarredura:
+    """Alternativa sem inotify (macOS, Windows, sistemas de arquivos de rede): varre a pasta"""
+
+    def __init__(self, pasta):
+        self.pasta = Path(pasta)
+
+    def esperar(self, timeout: float) -> set:
+        time.sleep(timeout)
+        return set(varrer(self.pasta))
+
+    def fechar(self):
+        pass
+
+
+def observador(pasta):
+    try:
+        return ObservadorInotify(pasta)
+    except (OSError, AttributeError):
+        return ObservadorVarredura(pasta)
+
+
+class Estabilizador:
+    """
+    Candidatos a entrar na fila: um arquivo só sai daqui depois de
+    espera segundos com o mesmo tamanho e mtime (cópia ou gravação acabou),
+    e só uma vez por versão: a varredura marca a pasta inteira a cada
+    INTERVALO, e um arquivo que não mudou não volta a ser liberado.
+    """
+
+    def __init__(self, espera: float = ESPERA_ESTAVEL):
+        self.espera = espera
+        self._vistos = {}  # caminho -> ((tamanho, mtime_ns), desde quando)
+        self._liberados = {}  # caminho -> (tamanho, mtime_ns) já liberado
+
+    def marcar(self, caminho: Path):
+        if caminho in self._vistos:
+            return
+        if caminho in self._liberados:
+            try:
+                info = os.stat(caminho)
+            except FileNotFoundError:
+                del self._liberados[caminho]
+                return
+            if self._liberados[caminho] == (info.st_size, info.st_mtime_ns):
+                return
+        self._vistos[caminho] = None
+
+    def estaveis(self) -> list:
+        agora = time.monotonic()
+        prontos = []
+        for caminho, anterior in list(self._vistos.items()):
+            try:
+                info = os.stat(caminho)
+            except FileNotFoundError:
+                del self._vistos[caminho]
+                continue
+            assinatura = (info.st_size, info.st_mtime_ns)
+            if anterior is None or anterior[0] != assinatura:
+                self._vistos[caminho] = (assinatura, agora)
+            elif info.st_size and agora - anterior[1] >= self.espera:
+                prontos.append(caminho)
+                del self._vistos[caminho]
+                self._liberados[caminho] = assinatura
+        return prontos
+
+
+class FilaTranscricoes:
+    """
+    Fila persistente por hash do conteúdo: o mesmo arquivo (ou uma cópia
+    dele com outro nome) entra uma vez só. Um item só vira "feito" depois
+    de escrito no markdown; o que estava pendente quando o processo caiu é
+    retomado no próximo início, e o que deu erro volta para a fila quando
+    o arquivo (ou uma cópia) aparece de novo, o que inclui a varredura de
+    cada início.
+    """
+
+    def __init__(self, caminho_db):
+        Path(caminho_db).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(caminho_db)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS fila (
+                sha256 TEXT PRIMARY KEY,
+                caminho TEXT NOT NULL,
+                estado TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                atualizado_em REAL NOT NULL,
+                erro TEXT
+            );
+            CREATE INDEX IF NOT EXISTS fila_estado ON fila (estado, criado_em);
+        """)
+
+    def adicionar(self, sha256: str, caminho) -> bool:
+        """False se esse conteúdo já foi transcrito ou já está na fila"""
+        agora = time.time()
+        with self._db:
+            cursor = self._db.execute(
+                """
+                INSERT INTO fila VALUES (?, ?, ?, ?, ?, NULL)
+                ON CONFLICT (sha256) DO UPDATE SET
+                    caminho = excluded.caminho, estado = excluded.estado,
+                    atualizado_em = excluded.atualizado_em, erro = NULL
+                WHERE fila.estado = ?
+                """,
+                (sha256, str(caminho), PENDENTE, agora, agora, ERRO),
+            )
+        return cursor.rowcount == 1
+
+    def pendentes(self) -> list:
+        """(sha256, caminho) na ordem de chegada"""
+        return self._db.execute(
+            "SELECT sha256, caminho FROM fila WHERE estado = ? ORDER BY criado_em", (PENDENTE,)
+        ).fetchall()
+
+    def _marcar(self, sha256: str, estado: str, erro: str = None):
+        with self._db:
+            self._db.execute(
+                "UPDATE fila SET estado = ?, atualizado_em = ?, erro = ? WHERE sha256 = ?",
+                (estado, time.time(), erro, sha256),
+            )
+
+    def concluir(self, sha256: str):
+        self._marcar(sha256, FEITO)
+
+    def falhar(self, sha256: str, erro: str):
+        self._marcar(sha256, ERRO, erro)
+
+    def fechar(self):
+        self._db.close()
+
+
+def vigiar(pasta, fila: FilaTranscricoes, processar, espera: float = ESPERA_ESTAVEL, hash_arquivo=hash_conteudo):
+    """
+    Laço do --watch (até Ctrl+C). processar(caminho) transcreve e grava um
+    arquivo; se levantar exceção, o item fica como erro na fila e o laço
+    segue. Arquivos que já estavam na pasta também entram (a fila descarta
+    os que já foram transcritos); com hash_arquivo =
+    CacheTranscricoes.hash_arquivo, os que não mudaram desde o último
+    início não são lidos de novo.
+    """
+    vigia = observador(pasta)
+    estabilizador = Estabilizador(espera)
+    tipo = "inotify" if isinstance(vigia, ObservadorInotify) else f"varredura a cada {INTERVALO:.0f}s"
+    print(f"[WATCH] Vigiando {pasta} ({tipo}); Ctrl+C para parar")
+
+    for caminho in varrer(pasta):
+        estabilizador.marcar(caminho)
+
+    try:
+        while True:
+            for sha256, caminho in fila.pendentes():
+                print(f"\n[FILA] Transcrevendo {Path(caminho).name}")
+                try:
+                    processar(Path(caminho))
+                except Exception as erro:
+                    print(f"[ERRO] {Path(caminho).name}: {erro}")
+                    fila.falhar(sha256, str(erro))
+                else:
+                    fila.concluir(sha256)
+
+            for caminho in vigia.esperar(INTERVALO):
+                estabilizador.marcar(caminho)
+
+            for caminho in estabilizador.estaveis():
+                try:
+                    sha256 = hash_arquivo(caminho)
+                except FileNotFoundError:
+                    continue
+                if fila.adicionar(sha256, caminho):
+                    print(f"[FILA] Novo arquivo: {caminho.name}")
+    except KeyboardInterrupt:
+        print("\n[WATCH] Encerrando")
+    finally:
+        vigia.fechar()